@@ -0,0 +1,156 @@
+"""
+Headless Game of Life runner and benchmark suite (no pygame, no window).
+
+    python bench.py run --backend bitpacked --width 1024 --height 1024 --generations 500 --seed 1
+    python bench.py suite --sizes 256 1024 --densities 0.1 0.3 --output results.json
+
+Every run prints one JSON object per line: generations/sec, cells/sec and
+peak traced memory (numpy allocations via tracemalloc). Tracing slows Python
+loops down several times, so the memory peak comes from a second, untimed
+repetition of the run. Memory held in shared memory by the parallel engine is
+not traced.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from cycles import run_until_cycle
+from engines import BACKENDS, create_engine
+from life import initialize_grid
+
+
+def _simulate(engine, generations: int, seed: int, stop_on_cycle: bool):
+    """Advance the engine; return the generations simulated and the cycle info (if any)."""
+    if not stop_on_cycle:
+        engine.step(generations)
+        return generations, {}
+    cycle = run_until_cycle(engine, generations, seed)
+    return cycle.pop("generations"), cycle
+
+
+def _close(engine):
+    if hasattr(engine, "close"):
+        engine.close()
+
+
+def run_headless(backend: str, width: int, height: int, generations: int,
+                 density: float = 0.10, seed: int = 0, stop_on_cycle: bool = False,
+                 measure_memory: bool = True) -> dict:
+    """
+    Run a seeded simulation without a display and measure its speed.
+
+    Parameters:
+        backend: One of the engines.BACKENDS names.
+        width, height: Board size.
+        generations: Number of generations to simulate.
+        density: Probability of a random live cell in the initial board.
+        seed: Seed for the initial board.
+        stop_on_cycle: Stop as soon as the board repeats (still life or oscillator);
+            the result then also has the transient length and the period.
+        measure_memory: Repeat the run under tracemalloc to measure peak memory
+            (the timed run is never traced; peak_memory_bytes is None otherwise).
+
+    Returns:
+        A dict with the run parameters and the measured results.
+    """
+    np.random.seed(seed)
+    grid = initialize_grid(width, height, density)
+
+    engine = create_engine(backend, grid.copy())
+    start = time.perf_counter()
+    simulated, cycle = _simulate(engine, generations, seed, stop_on_cycle)
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        traced = create_engine(backend, grid)
+        del grid
+        _simulate(traced, generations, seed, stop_on_cycle)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _close(traced)
+    generations = simulated
+
+    population = engine.population()
+    _close(engine)
+    return {
+        "backend": backend,
+        "width": width,
+        "height": height,
+        "density": density,
+        "seed": seed,
+        "generations": generations,
+        "seconds": elapsed,
+        "generations_per_sec": generations / elapsed if elapsed else float("inf"),
+        "cells_per_sec": generations * width * height / elapsed if elapsed else float("inf"),
+        "peak_memory_bytes": peak,
+        "population": population,
+        **cycle,
+    }
+
+
+def run_suite(backends, sizes, densities, generations: int, seed: int = 0, measure_memory: bool = True):
+    """Yield run_headless results for every backend x size x density combination."""
+    for size in sizes:
+        for density in densities:
+            for backend in backends:
+                yield run_headless(backend, size, size, generations, density, seed,
+                                   measure_memory=measure_memory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Game of Life runner and benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="simulate N generations of one board")
+    run.add_argument("--backend", choices=BACKENDS, default="dense")
+    run.add_argument("--width", type=int, default=192)
+    run.add_argument("--height", type=int, default=108)
+    run.add_argument("--generations", type=int, default=1000)
+    run.add_argument("--density", type=float, default=0.10)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--stop-on-cycle", action="store_true",
+                     help="stop when the board reaches a still life or an oscillation")
+    run.add_argument("--no-memory", action="store_true", help="skip the traced pass that measures peak memory")
+
+    suite = commands.add_parser("suite", help="benchmark a matrix of backends, sizes and densities")
+    suite.add_argument("--backends", nargs="+", choices=BACKENDS, default=["dense", "bitpacked", "tiled"])
+    suite.add_argument("--sizes", type=int, nargs="+", default=[128, 512, 2048])
+    suite.add_argument("--densities", type=float, nargs="+", default=[0.05, 0.10, 0.30])
+    suite.add_argument("--generations", type=int, default=50)
+    suite.add_argument("--seed", type=int, default=0)
+    suite.add_argument("--no-memory", action="store_true", help="skip the traced pass that measures peak memory")
+    suite.add_argument("--output", help="also write all results as one JSON document")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        print(json.dumps(run_headless(args.backend, args.width, args.height, args.generations,
+                                      args.density, args.seed, args.stop_on_cycle,
+                                      not args.no_memory)))
+        return
+
+    results = []
+    for result in run_suite(args.backends, args.sizes, args.densities, args.generations, args.seed,
+                            not args.no_memory):
+        results.append(result)
+        print(json.dumps(result), flush=True)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "python": sys.version.split()[0],
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "results": results,
+            }, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cycle and still-life detection for Game of Life runs.
+
+The board is hashed with Zobrist hashing: every cell has a random 64-bit
+key and the hash of a board is the XOR of the keys of its live cells. When a
+generation flips some cells the hash is updated by XOR-ing just their keys,
+so the cost per generation is proportional to the number of changed cells.
+Hashes of recent generations are kept in a dictionary; a repeated hash means
+the run has entered a cycle (period 1 is a still life or an empty board).
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+class CycleDetector:
+    """
+    Incremental board-hash history that detects period-p cycles.
+
+    With 64-bit hashes a false match is practically impossible for the run
+    lengths used here, so hashes are not verified against stored boards.
+    """
+
+    def __init__(self, board: np.array, seed: int = 0, max_history: int = None):
+        """
+        Parameters:
+            board: 2D array with the initial board (generation 0).
+            seed: Seed for the random cell keys.
+            max_history: How many past generations to remember (None - all);
+                only cycles with a period up to this value are detected.
+        """
+        rng = np.random.default_rng(seed)
+        self.keys = rng.integers(0, np.iinfo(np.uint64).max, size=np.shape(board),
+                                 dtype=np.uint64, endpoint=True)
+        self.hash = np.bitwise_xor.reduce(self.keys[np.asarray(board) == 1])
+        self.generation = 0
+        self.max_history = max_history
+        self._seen = {self.hash: 0}
+        self._order = deque([self.hash])
+        # (transient length, period) once a cycle has been found
+        self.cycle = None
+
+    def update(self, old: np.array, new: np.array, tiles: list = None):
+        """
+        Register the next generation.
+
+        Parameters:
+            old: 2D array with the previous board.
+            new: 2D array with the new board.
+            tiles: Optional list of (top, left, height, width) rectangles that
+                contain all changed cells (e.g. from TiledLife.dirty_tiles()).
+
+        Returns:
+            (transient, period) if the new board repeats an earlier one, else None.
+        """
+        if tiles is None:
+            self.hash ^= np.bitwise_xor.reduce(self.keys[old != new])
+        else:
+            for top, left, height, width in tiles:
+                rows, cols = slice(top, top + height), slice(left, left + width)
+                self.hash ^= np.bitwise_xor.reduce(self.keys[rows, cols][old[rows, cols] != new[rows, cols]])
+        self.generation += 1
+        return self._register()
+
+    def _register(self):
+        first = self._seen.get(self.hash)
+        if first is not None:
+            self.cycle = (first, self.generation - first)
+            return self.cycle
+        self._seen[self.hash] = self.generation
+        self._order.append(self.hash)
+        if self.max_history is not None and len(self._order) > self.max_history:
+            del self._seen[self._order.popleft()]
+        return None
+
+
+def run_until_cycle(engine, max_generations: int, seed: int = 0, max_history: int = None) -> dict:
+    """
+    Step an engine until its board repeats or max_generations is reached.
+
+    Returns:
+        A dict with the number of generations run, and the transient length
+        and period of the cycle (None if no cycle was found).
+    """
+    board = engine.to_dense().copy()
+    detector = CycleDetector(board, seed, max_history)
+    for _ in range(max_generations):
+        engine.step()
+        if hasattr(engine, "dirty_tiles"):
+            # The tiled engine updates its board in place and knows what changed
+            found = detector.update(engine.previous, engine.grid, engine.dirty_tiles())
+        else:
+            new = engine.to_dense()
+            found = detector.update(board, new)
+            board = new
+        if found:
+            break
+    transient, period = detector.cycle or (None, None)
+    return {"generations": detector.generation, "transient": transient, "period": period}
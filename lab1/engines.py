@@ -0,0 +1,35 @@
+"""Registry of the Game of Life engines that main() can run."""
+
+import numpy as np
+
+from bitlife import BitPackedLife
+from hashlife import HashLife
+from life import DenseLife
+from parallel import ParallelLife
+from tiled import TiledLife
+
+# Backend name -> factory that builds an engine from a dense initial board
+BACKENDS = {
+    "dense": DenseLife,
+    "bitpacked": BitPackedLife.from_dense,
+    # Unbounded plane instead of a torus: only the initial board area is shown
+    "hashlife": HashLife.from_dense,
+    "tiled": TiledLife,
+    "parallel": ParallelLife,
+}
+
+
+def create_engine(backend: str, grid: np.array):
+    """
+    Create a Game of Life engine.
+
+    Parameters:
+        backend: One of the BACKENDS names.
+        grid: 2D numpy array with the initial board.
+
+    Returns:
+        An engine with step(), to_dense() and population() methods.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of: {', '.join(BACKENDS)}")
+    return BACKENDS[backend](grid)
@@ -0,0 +1,233 @@
+"""
+HashLife engine: a memoized quadtree that can jump 2^k generations at once.
+
+Unlike the numpy engines the HashLife universe is an unbounded plane, not a
+torus. Its results match the dense engine as long as the pattern does not
+reach the edge of the dense board (e.g. a glider with enough empty space).
+World coordinates are the row/column coordinates of the initial board.
+"""
+
+import numpy as np
+
+# Default bound for the canonical node table before it is garbage collected
+MAX_NODES = 1 << 21
+
+
+class Node:
+    """Canonical quadtree node; level 0 nodes are single cells."""
+
+    __slots__ = ("nw", "ne", "sw", "se", "level", "population", "results")
+
+    def __init__(self, nw, ne, sw, se, level: int, population: int):
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.level = level
+        self.population = population
+        # Memoized successors: j -> centre advanced by 2^j generations
+        self.results = None
+
+
+OFF = Node(None, None, None, None, 0, 0)
+ON = Node(None, None, None, None, 0, 1)
+
+
+class HashLife:
+    """
+    Game of Life engine based on Gosper's HashLife algorithm.
+
+    Nodes are hash-consed in a canonical table, so equal sub-patterns share
+    one node and one memoized result. When the table grows past `max_nodes`
+    it is rebuilt from the nodes reachable from the current root and all
+    memoized results are dropped.
+    """
+
+    def __init__(self, max_nodes: int = MAX_NODES):
+        self.max_nodes = max_nodes
+        self._cache = {}
+        self._empty = [OFF]
+        self.generation = 0
+        # Size of the dense board the universe was created from (see to_dense)
+        self.shape = (0, 0)
+        # World coordinates (row, column) of the centre of the root node
+        self._center = (0, 0)
+        self.root = self._empty_node(3)
+
+    @classmethod
+    def from_dense(cls, grid: np.array, max_nodes: int = MAX_NODES) -> "HashLife":
+        """Create a universe holding the given dense board at rows/columns starting from 0."""
+        grid = np.asarray(grid) == 1
+        life = cls(max_nodes)
+        level = max(3, int(max(grid.shape) - 1).bit_length())
+        life.root = life._build(grid, 0, 0, level)
+        life._center = (1 << (level - 1), 1 << (level - 1))
+        life.shape = grid.shape
+        return life
+
+    def _build(self, grid: np.array, top: int, left: int, level: int) -> Node:
+        if level == 0:
+            return ON if grid[top, left] else OFF
+        size = 1 << level
+        if not grid[top:top + size, left:left + size].any():
+            return self._empty_node(level)
+        half = size >> 1
+        return self._join(self._build(grid, top, left, level - 1),
+                          self._build(grid, top, left + half, level - 1),
+                          self._build(grid, top + half, left, level - 1),
+                          self._build(grid, top + half, left + half, level - 1))
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Return the canonical node with the given quadrants."""
+        key = (nw, ne, sw, se)
+        node = self._cache.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1,
+                        nw.population + ne.population + sw.population + se.population)
+            self._cache[key] = node
+        return node
+
+    def _empty_node(self, level: int) -> Node:
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self._join(e, e, e, e))
+        return self._empty[level]
+
+    def _expand(self, node: Node) -> Node:
+        """Return a node one level up with `node` in its centre."""
+        e = self._empty_node(node.level - 1)
+        return self._join(self._join(e, e, e, node.nw), self._join(e, e, node.ne, e),
+                          self._join(e, node.sw, e, e), self._join(node.se, e, e, e))
+
+    def _centre(self, node: Node) -> Node:
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _life_4x4(self, node: Node) -> Node:
+        """Advance the centre 2x2 of a level 2 node by one generation."""
+        rows = ((node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne),
+                (node.nw.sw, node.nw.se, node.ne.sw, node.ne.se),
+                (node.sw.nw, node.sw.ne, node.se.nw, node.se.ne),
+                (node.sw.sw, node.sw.se, node.se.sw, node.se.se))
+        cells = [[cell.population for cell in row] for row in rows]
+        result = []
+        for i in (1, 2):
+            for j in (1, 2):
+                total = sum(cells[y][x] for y in (i - 1, i, i + 1) for x in (j - 1, j, j + 1))
+                # The 3x3 total includes the cell itself
+                alive = total == 3 or (total == 4 and cells[i][j])
+                result.append(ON if alive else OFF)
+        return self._join(*result)
+
+    def _successor(self, node: Node, j: int) -> Node:
+        """
+        Return the centre of `node` (one level down) advanced by 2^j generations.
+
+        Requires 0 <= j <= node.level - 2.
+        """
+        if node.population == 0:
+            return node.nw
+        if node.results is None:
+            node.results = {}
+        elif j in node.results:
+            return node.results[j]
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            # Nine overlapping sub-nodes one level down
+            parts = [nw, self._join(nw.ne, ne.nw, nw.se, ne.sw), ne,
+                     self._join(nw.sw, nw.se, sw.nw, sw.ne), self._centre(node),
+                     self._join(ne.sw, ne.se, se.nw, se.ne),
+                     sw, self._join(sw.ne, se.nw, sw.se, se.sw), se]
+            if j == node.level - 2:
+                # Full speed: both halves of the jump are taken recursively
+                parts = [self._successor(p, j - 1) for p in parts]
+                step = j - 1
+            else:
+                parts = [self._centre(p) for p in parts]
+                step = j
+            p = parts
+            result = self._join(
+                self._successor(self._join(p[0], p[1], p[3], p[4]), step),
+                self._successor(self._join(p[1], p[2], p[4], p[5]), step),
+                self._successor(self._join(p[3], p[4], p[6], p[7]), step),
+                self._successor(self._join(p[4], p[5], p[7], p[8]), step))
+
+        node.results[j] = result
+        return result
+
+    def jump(self, k: int):
+        """Advance the universe by exactly 2^k generations in one quadtree step."""
+        root = self.root
+        # Pad until the pattern sits in the central quarter with a margin of at least 2^k
+        while root.level < k + 3 or root.population != self._centre(self._centre(root)).population:
+            root = self._expand(root)
+        self.root = self._successor(root, k)
+        self.generation += 1 << k
+        if len(self._cache) > self.max_nodes:
+            self.collect()
+
+    def advance(self, generations: int):
+        """Advance the universe by an arbitrary number of generations."""
+        k = 0
+        while generations:
+            if generations & 1:
+                self.jump(k)
+            generations >>= 1
+            k += 1
+
+    def step(self, generations: int = 1):
+        """Advance the universe by the given number of generations."""
+        self.advance(generations)
+
+    def collect(self):
+        """Rebuild the canonical table from the nodes reachable from the root."""
+        old = self._cache
+        self._cache = {}
+        self._empty = [OFF]
+        for node in old.values():
+            node.results = None
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in self._cache:
+                self._cache[key] = node
+                stack.extend(key)
+
+    @property
+    def cache_size(self) -> int:
+        """Number of nodes in the canonical table."""
+        return len(self._cache)
+
+    def population(self) -> int:
+        """Return the number of live cells."""
+        return self.root.population
+
+    def to_dense(self) -> np.array:
+        """Return the window covered by the initial board (cells outside it are not wrapped)."""
+        return self.window(0, 0, *self.shape)
+
+    def window(self, top: int, left: int, height: int, width: int) -> np.array:
+        """
+        Export a rectangular part of the universe as a dense uint8 array.
+
+        Parameters:
+            top, left: World coordinates of the upper-left corner.
+            height, width: Size of the window.
+        """
+        out = np.zeros((height, width), dtype=np.uint8)
+        half = 1 << (self.root.level - 1)
+        stack = [(self.root, self._center[0] - half - top, self._center[1] - half - left)]
+        while stack:
+            node, y, x = stack.pop()
+            size = 1 << node.level
+            if node.population == 0 or y >= height or x >= width or y + size <= 0 or x + size <= 0:
+                continue
+            if node.level == 0:
+                out[y, x] = 1
+                continue
+            half = size >> 1
+            stack.extend(((node.nw, y, x), (node.ne, y, x + half),
+                          (node.sw, y + half, x), (node.se, y + half, x + half)))
+        return out
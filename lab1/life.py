@@ -0,0 +1,123 @@
+"""Dense numpy implementation of Conway's Game of Life on a toroidal grid."""
+
+import numpy as np
+
+from patterns import PatternLibrary
+
+
+def count_neighbors(matrix: np.array) -> np.array:
+    """
+    Count the live neighbors of every cell on a toroidal grid.
+
+    Parameters:
+        matrix: 2D numpy array representing the current grid state.
+
+    Returns:
+        A 2D integer array with the number of live neighbors for each cell.
+    """
+    alive = matrix.astype(np.uint8)
+    up, down = np.roll(alive, 1, axis=0), np.roll(alive, -1, axis=0)
+    # The three rows around a cell, then shifted left and right
+    column = up + alive + down
+    return column + np.roll(column, 1, axis=1) + np.roll(column, -1, axis=1) - alive
+
+
+def step_grid(matrix: np.array) -> np.array:
+    """
+    Compute the next generation of the grid with whole-array boolean operations.
+
+    Parameters:
+        matrix: 2D numpy array representing the current grid state.
+
+    Returns:
+        A new numpy array (same dtype as the input) with the next grid state.
+    """
+    neighbor_count = count_neighbors(matrix)
+    # Birth with exactly 3 neighbors, survival with 2 or 3
+    alive = (neighbor_count == 3) | ((matrix == 1) & (neighbor_count == 2))
+    return alive.astype(matrix.dtype)
+
+
+def step_band(rows: np.array) -> np.array:
+    """
+    Compute the next generation of a horizontal band of a toroidal grid.
+
+    Parameters:
+        rows: 2D uint8 array with the band plus one halo row above and below.
+
+    Returns:
+        A uint8 array with the next state of the band (without the halo rows).
+    """
+    column = rows[:-2] + rows[1:-1] + rows[2:]
+    total = column + np.roll(column, 1, axis=1) + np.roll(column, -1, axis=1)
+    # The 3x3 total includes the cell itself
+    return ((total == 3) | ((total == 4) & (rows[1:-1] == 1))).astype(np.uint8)
+
+
+def initialize_grid(width: int, height: int, density: float = 0.10) -> np.array:
+    """
+    Initialize the grid with an initial pattern.
+
+    Parameters:
+        width: Number of columns in the grid.
+        height: Number of rows in the grid.
+        density: Probability of a random live cell.
+
+    Returns:
+        A numpy array representing the initial grid state.
+    """
+    grid = np.zeros((height, width))
+
+    # Classic patterns of the game "Life" from the pattern library (lab1/patterns)
+    library = PatternLibrary()
+
+    # Positions to place patterns (row, column)
+    positions = {
+        "block": (20, 2),
+        "blinker": (0, 1),
+        "toad": (2, 20),
+        "glider": (10, 2),
+        "beacon": (10, 10),
+        "lwss": (101, 95)
+    }
+
+    # Stream each pattern into the grid (skipping ones that do not fit)
+    for name, pos in positions.items():
+        ph, pw = library.size(name)
+        if pos[0] + ph <= height and pos[1] + pw <= width:
+            library.place(name, grid, *pos)
+
+    # Add random cells throughout the grid (10% probability of occurrence by default)
+    random_cells = (np.random.rand(height, width) < density).astype(int)
+    # Combine patterns with random cells (if both have live cells, 1 is left)
+    grid = np.maximum(grid, random_cells)
+
+    return grid
+
+
+class DenseLife:
+    """
+    Reference engine that keeps the board as a dense uint8 array.
+
+    All engines share the same small interface: step(generations),
+    to_dense(), population(), plus the shape and generation attributes.
+    """
+
+    def __init__(self, grid: np.array):
+        self.grid = (np.asarray(grid) == 1).astype(np.uint8)
+        self.shape = self.grid.shape
+        self.generation = 0
+
+    def step(self, generations: int = 1):
+        """Advance the board by the given number of generations."""
+        for _ in range(generations):
+            self.grid = step_grid(self.grid)
+        self.generation += generations
+
+    def to_dense(self) -> np.array:
+        """Return the board as a 2D uint8 array (0 - dead, 1 - alive)."""
+        return self.grid
+
+    def population(self) -> int:
+        """Return the number of live cells."""
+        return int(np.count_nonzero(self.grid))
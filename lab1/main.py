@@ -2,9 +2,15 @@ import os
 
 os.environ['SDL_VIDEO_MINIMIZE_ON_FOCUS_LOSS'] = '0'
 
+import argparse
+
 import numpy as np
 import pygame
 
+from engines import BACKENDS, create_engine
+from life import initialize_grid, step_grid
+from recording import Recorder, RecordingPlayer
+
 # Define colors
 DIE_COLOR = (255, 0, 0)
 LIVE_COLOR = (0, 255, 0)
@@ -12,132 +18,129 @@ BG_COLOR = (47, 79, 79)
 GRID_COLOR = (70, 130, 180)
 
 
-def update_grid(surface: pygame, matrix: np.array, scale: int) -> np.array:
+# Palette order used by the renderer
+BG_INDEX, LIVE_INDEX, DIE_INDEX, GRID_INDEX = 0, 1, 2, 3
+PALETTE = (BG_COLOR, LIVE_COLOR, DIE_COLOR, GRID_COLOR)
+
+
+def map_palette(surface: pygame.Surface) -> np.array:
+    """Map PALETTE to the pixel format of the given surface."""
+    return np.array([surface.map_rgb(color) for color in PALETTE], dtype=np.uint32)
+
+
+def grid_pixels(matrix: np.array, new_matrix: np.array, scale: int, palette: np.array) -> np.array:
     """
-    Update the grid based on Conway's Game of Life rules and draw the new state.
+    Map the transition between two grid states to a mapped-pixel array.
+
+    Cells that are alive in the new state are drawn with LIVE_COLOR, cells that
+    just died with DIE_COLOR and everything else with BG_COLOR. The last pixel
+    row and column of every cell is left in GRID_COLOR.
 
     Parameters:
-        surface: The pygame surface to draw on.
-        matrix: 2D numpy array representing the current grid state.
+        matrix: 2D numpy array with the previous grid state.
+        new_matrix: 2D numpy array with the current grid state.
         scale: The pixel size of each cell.
+        palette: PALETTE mapped to the target surface (see map_palette).
 
     Returns:
-        A new numpy array representing the updated grid state.
+        A (width * scale, height * scale) uint32 array in pygame surfarray order.
     """
-    new_matrix = np.zeros(matrix.shape)
-
-    # Count the number of live neighbors for each cell (toroidal grid)
-    neighbor_count = (
-            np.roll(matrix, 1, axis=0) + np.roll(matrix, -1, axis=0) +  # Up and down
-            np.roll(matrix, 1, axis=1) + np.roll(matrix, -1, axis=1) +  # Left and right
-            np.roll(np.roll(matrix, 1, axis=0), 1, axis=1) +  # Upper right
-            np.roll(np.roll(matrix, 1, axis=0), -1, axis=1) +  # Upper left
-            np.roll(np.roll(matrix, -1, axis=0), 1, axis=1) +  # Lower right
-            np.roll(np.roll(matrix, -1, axis=0), -1, axis=1)  # Lower left
-    )
-
-    for i, j in np.ndindex(matrix.shape):
-        live_neighbors = neighbor_count[i, j]
-
-        if matrix[i, j] == 1:
-            # Live cell: dies if underpopulated or overpopulated
-            if live_neighbors < 2 or live_neighbors > 3:
-                cell_color = DIE_COLOR
-            else:
-                new_matrix[i, j] = 1
-                cell_color = LIVE_COLOR
-        else:
-            # Dead cell: becomes alive if exactly 3 live neighbors
-            if live_neighbors == 3:
-                new_matrix[i, j] = 1
-                cell_color = LIVE_COLOR
-            else:
-                cell_color = BG_COLOR
-
-        # Draw the cell on the surface
-        pygame.draw.rect(surface, cell_color, (j * scale, i * scale, scale - 1, scale - 1))
+    state = np.full(matrix.shape, BG_INDEX, dtype=np.uint8)
+    state[matrix == 1] = DIE_INDEX
+    state[new_matrix == 1] = LIVE_INDEX
 
-    return new_matrix
+    # Expand every cell to a scale x scale block (transposed to x, y order)
+    height, width = state.shape
+    blocks = np.empty((width, scale, height, scale), dtype=np.uint32)
+    blocks[...] = palette[state.T][:, None, :, None]
+    blocks[:, -1, :, :] = palette[GRID_INDEX]
+    blocks[:, :, :, -1] = palette[GRID_INDEX]
+    return blocks.reshape(width * scale, height * scale)
+
+
+def draw_grid(surface: pygame.Surface, matrix: np.array, new_matrix: np.array, scale: int):
+    """
+    Draw the transition between two grid states with a single surfarray blit.
+
+    Parameters:
+        surface: The pygame surface to draw on (must be grid size times scale).
+        matrix: 2D numpy array with the previous grid state.
+        new_matrix: 2D numpy array with the current grid state.
+        scale: The pixel size of each cell.
+    """
+    pixels = grid_pixels(matrix, new_matrix, scale, map_palette(surface))
+    pygame.surfarray.blit_array(surface, pixels)
 
 
-def initialize_grid(width: int, height: int) -> np.array:
+def draw_tiles(surface: pygame.Surface, matrix: np.array, new_matrix: np.array, tiles: list,
+               scale: int) -> list:
     """
-    Initialize the grid with an initial pattern.
+    Redraw only the given rectangular parts of the grid.
 
     Parameters:
-        width: Number of columns in the grid.
-        height: Number of rows in the grid.
+        surface: The pygame surface to draw on.
+        matrix: 2D numpy array with the previous grid state.
+        new_matrix: 2D numpy array with the current grid state.
+        tiles: List of (top, left, height, width) rectangles in cells.
+        scale: The pixel size of each cell.
 
     Returns:
-        A numpy array representing the initial grid state.
+        The list of redrawn pygame.Rect areas, ready for pygame.display.update.
+    """
+    palette = map_palette(surface)
+    rects = []
+    for top, left, height, width in tiles:
+        rows, cols = slice(top, top + height), slice(left, left + width)
+        rect = pygame.Rect(left * scale, top * scale, width * scale, height * scale)
+        pixels = grid_pixels(matrix[rows, cols], new_matrix[rows, cols], scale, palette)
+        pygame.surfarray.blit_array(surface.subsurface(rect), pixels)
+        rects.append(rect)
+    return rects
+
+
+def update_grid(surface: pygame.Surface, matrix: np.array, scale: int) -> np.array:
     """
-    grid = np.zeros((height, width))
-
-    # Classic patterns of the game "Life”
-    patterns = {
-        "block": np.array([
-            [1, 1],
-            [1, 1]
-        ]),
-        "blinker": np.array([
-            [1, 1, 1]
-        ]),
-        "toad": np.array([
-            [0, 1, 1, 1],
-            [1, 1, 1, 0]
-        ]),
-        "glider": np.array([
-            [0, 1, 0],
-            [0, 0, 1],
-            [1, 1, 1]
-        ]),
-        "beacon": np.array([
-            [1, 1, 0, 0],
-            [1, 1, 0, 0],
-            [0, 0, 1, 1],
-            [0, 0, 1, 1]
-        ]),
-        "lwss": np.array([
-            [0, 1, 0, 0, 1],
-            [1, 0, 0, 0, 0],
-            [1, 0, 0, 0, 1],
-            [1, 1, 1, 1, 0]
-        ])
-    }
-
-    # Positions to place patterns (row, column)
-    positions = {
-        "block": (20, 2),
-        "blinker": (0, 1),
-        "toad": (2, 20),
-        "glider": (10, 2),
-        "beacon": (10, 10),
-        "lwss": (101, 95)
-    }
-
-    # Place each pattern at a given grid position
-    for name, pat in patterns.items():
-        pos = positions[name]
-        ph, pw = pat.shape
-        grid[pos[0]:pos[0] + ph, pos[1]:pos[1] + pw] = pat
-
-    # Add random cells throughout the grid (10% probability of occurrence)
-    random_cells = (np.random.rand(height, width) < 0.10).astype(int)
-    # Combine patterns with random cells (if both have live cells, 1 is left)
-    grid = np.maximum(grid, random_cells)
-
-    return grid
+    Update the grid based on Conway's Game of Life rules and draw the new state.
+
+    Parameters:
+        surface: The pygame surface to draw on.
+        matrix: 2D numpy array representing the current grid state.
+        scale: The pixel size of each cell.
+
+    Returns:
+        A new numpy array representing the updated grid state.
+    """
+    new_matrix = step_grid(matrix)
+    draw_grid(surface, matrix, new_matrix, scale)
+    return new_matrix
 
 
 def main():
-    pygame.init()
-    pygame.display.set_caption("Game of Life")
+    parser = argparse.ArgumentParser(description="Conway's Game of Life")
+    parser.add_argument("--backend", choices=BACKENDS, default="dense",
+                        help="simulation engine (default: dense)")
+    parser.add_argument("--record", metavar="FILE", help="record the run to a file")
+    parser.add_argument("--play", metavar="FILE", help="play a recorded run instead of simulating")
+    args = parser.parse_args()
 
     # Grid dimensions and cell size
     width, height, scale = 192, 108, 10
+    if args.play:
+        engine = RecordingPlayer(args.play)
+        height, width = engine.shape
+    else:
+        engine = create_engine(args.backend, initialize_grid(width, height))
+    recorder = Recorder(args.record, engine.shape) if args.record else None
+    if recorder:
+        recorder.write(engine.to_dense())
+
+    pygame.init()
+    pygame.display.set_caption("Game of Life")
     screen = pygame.display.set_mode((width * scale, height * scale))
 
-    cells = initialize_grid(width, height)
+    cells = engine.to_dense()
+    draw_grid(screen, cells, cells, scale)
+    pygame.display.flip()
     clock = pygame.time.Clock()
     running = True
 
@@ -147,14 +150,26 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
 
-        # Fill background with the grid color
-        screen.fill(GRID_COLOR)
+        engine.step()
+        if recorder:
+            recorder.write(engine.to_dense())
+        if hasattr(engine, "dirty_tiles"):
+            # Redraw only the tiles that changed and update just those rectangles
+            rects = draw_tiles(screen, engine.previous, engine.grid, engine.dirty_tiles(), scale)
+            pygame.display.update(rects)
+            continue
 
-        # Update grid and draw cells
-        cells = update_grid(screen, cells, scale)
+        # Update grid and draw cells (the blit covers the whole screen)
+        new_cells = engine.to_dense()
+        draw_grid(screen, cells, new_cells, scale)
+        cells = new_cells
 
         pygame.display.flip()
 
+    if recorder:
+        recorder.close()
+    if hasattr(engine, "close"):
+        engine.close()
     pygame.quit()
 
 
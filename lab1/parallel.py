@@ -0,0 +1,151 @@
+"""
+Multi-core Game of Life engine over shared memory.
+
+The toroidal board lives in two multiprocessing.shared_memory buffers (the
+current and the next generation). Every step the board is split into
+horizontal bands; each worker reads its band plus one halo row above and
+below (wrapping around like np.roll) and writes the band of the next
+generation, so no board data is pickled between processes.
+"""
+
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from life import step_band
+
+# Buffers attached in a worker process by _attach
+_buffers = []
+
+
+def _attach(names: list, shape: tuple):
+    """Pool initializer: map both shared board buffers in the worker."""
+    global _buffers
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _buffers = [(block, np.ndarray(shape, dtype=np.uint8, buffer=block.buf)) for block in blocks]
+
+
+def _step_band(task: tuple):
+    """Compute rows top..bottom of the next generation from buffer `source`."""
+    source, top, bottom = task
+    current, target = _buffers[source][1], _buffers[1 - source][1]
+    rows = current.take(np.arange(top - 1, bottom + 1), axis=0, mode="wrap")
+    target[top:bottom] = step_band(rows)
+
+
+class ParallelLife:
+    """
+    Game of Life engine that steps horizontal bands in a process pool.
+
+    The engine owns a pool and two shared memory blocks; call close() (or use
+    it as a context manager) to release them.
+    """
+
+    def __init__(self, grid: np.array, workers: int = None, bands: int = None):
+        self.shape = np.shape(grid)
+        self.workers = workers or os.cpu_count() or 1
+        self.generation = 0
+        size = max(1, self.shape[0] * self.shape[1])
+        self._blocks = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+        self._boards = [np.ndarray(self.shape, dtype=np.uint8, buffer=block.buf) for block in self._blocks]
+        self._boards[0][...] = np.asarray(grid) == 1
+        self._current = 0
+
+        height = self.shape[0]
+        bands = min(height, bands or self.workers)
+        edges = np.linspace(0, height, bands + 1).astype(int)
+        self._bands = list(zip(edges[:-1], edges[1:]))
+        self._pool = Pool(self.workers, initializer=_attach,
+                          initargs=([block.name for block in self._blocks], self.shape))
+
+    def step(self, generations: int = 1):
+        """Advance the board by the given number of generations."""
+        for _ in range(generations):
+            self._pool.map(_step_band, [(self._current, top, bottom) for top, bottom in self._bands])
+            self._current = 1 - self._current
+        self.generation += generations
+
+    def to_dense(self) -> np.array:
+        """Return a copy of the board as a 2D uint8 array (0 - dead, 1 - alive)."""
+        return self._boards[self._current].copy()
+
+    def population(self) -> int:
+        """Return the number of live cells."""
+        return int(np.count_nonzero(self._boards[self._current]))
+
+    def close(self):
+        """Stop the worker pool and release the shared memory."""
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+        self._boards = []
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def scaling_benchmark(size: int = 4096, generations: int = 20, workers=(1, 2, 4, 8),
+                      density: float = 0.10, seed: int = 0) -> list:
+    """
+    Measure generations per second of ParallelLife for several worker counts.
+
+    Returns:
+        A list of result dicts (one per worker count); the board is checked to
+        match the serial engine after the run. Every engine makes one untimed
+        warm-up step first, so `generations` steps are timed after it.
+    """
+    from life import DenseLife
+
+    if generations < 1:
+        raise ValueError("generations must be at least 1")
+    grid = (np.random.default_rng(seed).random((size, size)) < density).astype(np.uint8)
+    reference = DenseLife(grid)
+    start = time.perf_counter()
+    reference.step(generations)
+    serial = generations / (time.perf_counter() - start)
+    reference.step()  # parallel engines are one warm-up step ahead
+
+    results = []
+    for count in workers:
+        with ParallelLife(grid, workers=count) as engine:
+            engine.step()  # warm up the pool
+            start = time.perf_counter()
+            engine.step(generations)
+            elapsed = time.perf_counter() - start
+            results.append({
+                "size": size,
+                "workers": count,
+                "generations_per_sec": generations / elapsed,
+                "speedup_vs_serial": generations / elapsed / serial,
+                "matches_serial": bool(np.array_equal(engine.to_dense(), reference.to_dense())),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the parallel Life engine")
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    if args.generations < 1:
+        parser.error("--generations must be at least 1")
+
+    for result in scaling_benchmark(args.size, args.generations, args.workers):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
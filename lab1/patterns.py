@@ -0,0 +1,151 @@
+"""
+Streaming loader for Game of Life pattern files (RLE and plaintext .cells).
+
+Patterns are read line by line and every horizontal run of live cells is
+written straight into the target board, so even multi-megabyte RLE files are
+never expanded into per-cell Python objects. A target is either a 2D numpy
+array or any object with a set_run(row, col, length) method (for example
+BitPackedLife). Cells that fall outside the target are clipped.
+"""
+
+import os
+import re
+
+import numpy as np
+
+# Directory with the patterns used by initialize_grid
+PATTERN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patterns")
+EXTENSIONS = (".rle", ".cells")
+
+RLE_TOKEN = re.compile(r"(\d*)([A-Za-z.$!])")
+RLE_PENDING = re.compile(r"\d+$")
+RLE_SIZE = re.compile(r"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)")
+CELLS_RUN = re.compile(r"[^.\s]+")
+
+
+def _run_writer(target, top: int, left: int):
+    """Return a set_run(row, col, length) function that places runs at (top, left)."""
+    height, width = target.shape
+    dense = isinstance(target, np.ndarray)
+
+    def set_run(row, col, length):
+        row, col = top + row, left + col
+        start, stop = max(col, 0), min(col + length, width)
+        if 0 <= row < height and start < stop:
+            if dense:
+                target[row, start:stop] = 1
+            else:
+                target.set_run(row, start, stop - start)
+    return set_run
+
+
+def _read_rle(file, set_run):
+    row = col = 0
+    pending = ""
+    for line in file:
+        if line.startswith("#") or line.lstrip().startswith("x"):
+            continue
+        # A run count may be split from its tag by a line break
+        line = pending + line.strip()
+        digits = RLE_PENDING.search(line)
+        pending = digits.group() if digits else ""
+        for count, tag in RLE_TOKEN.findall(line):
+            count = int(count) if count else 1
+            if tag == "$":
+                row, col = row + count, 0
+            elif tag == "!":
+                return
+            elif tag in "b.":
+                col += count
+            else:
+                # 'o' (or any other state letter) is a live cell
+                set_run(row, col, count)
+                col += count
+
+
+def _read_cells(file, set_run):
+    row = 0
+    for line in file:
+        if line.startswith("!"):
+            continue
+        for match in CELLS_RUN.finditer(line):
+            set_run(row, match.start(), match.end() - match.start())
+        row += 1
+
+
+def load_pattern(path: str, target, top: int = 0, left: int = 0):
+    """
+    Stream a pattern file into a board.
+
+    Parameters:
+        path: Path to a .rle or .cells file.
+        target: 2D numpy array or an object with set_run(row, col, length) and shape.
+        top, left: Board position of the upper-left corner of the pattern.
+    """
+    reader = _read_rle if path.endswith(".rle") else _read_cells
+    with open(path) as file:
+        reader(file, _run_writer(target, top, left))
+
+
+def pattern_size(path: str) -> tuple:
+    """
+    Return the (height, width) of a pattern.
+
+    RLE files are answered from the header line; .cells files are scanned
+    line by line without storing them.
+    """
+    with open(path) as file:
+        if path.endswith(".rle"):
+            for line in file:
+                match = RLE_SIZE.match(line.strip())
+                if match:
+                    return int(match.group(2)), int(match.group(1))
+                if not line.startswith("#"):
+                    break
+            raise ValueError(f"{path} has no 'x = ..., y = ...' header")
+        height = width = 0
+        for line in file:
+            if line.startswith("!"):
+                continue
+            height += 1
+            width = max(width, len(line.rstrip()))
+        return height, width
+
+
+class PatternLibrary:
+    """
+    Lazily indexed directory of pattern files.
+
+    Only file names are listed (on first use); a pattern is opened when its
+    size is asked for or when it is placed on a board.
+    """
+
+    def __init__(self, directory: str = PATTERN_DIR):
+        self.directory = directory
+        self._paths = None
+        self._sizes = {}
+
+    @property
+    def paths(self) -> dict:
+        """Mapping of pattern name (file name without extension) to path."""
+        if self._paths is None:
+            self._paths = {}
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    name, extension = os.path.splitext(entry.name)
+                    if extension in EXTENSIONS and entry.is_file():
+                        self._paths[name] = entry.path
+        return self._paths
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.paths
+
+    def size(self, name: str) -> tuple:
+        """Return the (height, width) of a pattern."""
+        if name not in self._sizes:
+            self._sizes[name] = pattern_size(self.paths[name])
+        return self._sizes[name]
+
+    def place(self, name: str, target, top: int = 0, left: int = 0):
+        """Stream the named pattern into a board at (top, left)."""
+        load_pattern(self.paths[name], target, top, left)
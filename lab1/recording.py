@@ -0,0 +1,148 @@
+"""
+Compressed on-disk recordings of Game of Life runs.
+
+File layout (little-endian):
+
+    header   magic, height, width, keyframe interval, frame count, index offset
+    frames   zlib-compressed packed bits, one frame per generation:
+             every `keyframe_interval`-th frame is the whole board, the
+             others are the XOR with the previous generation
+    index    uint64 offset of every frame, plus the offset of the index itself
+
+Playback memory-maps the file, finds the nearest keyframe through the index
+in O(1) and applies at most keyframe_interval - 1 deltas to reach any
+generation, without reading the rest of the run.
+"""
+
+import mmap
+import struct
+import zlib
+
+import numpy as np
+
+MAGIC = b"LIFEREC1"
+HEADER = struct.Struct("<8sIIIQQ")
+
+
+def _pack(board: np.array) -> np.array:
+    return np.packbits(np.asarray(board, dtype=np.uint8).ravel())
+
+
+class Recorder:
+    """Stream generations of a board to a recording file."""
+
+    def __init__(self, path: str, shape: tuple, keyframe_interval: int = 64, level: int = 1):
+        self.shape = tuple(shape)
+        self.keyframe_interval = keyframe_interval
+        self.level = level
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, self.shape[0], self.shape[1], keyframe_interval, 0, 0))
+        self._offsets = []
+        self._previous = None
+
+    def write(self, board: np.array):
+        """Append the next generation (a 2D array, cells equal to 1 are alive)."""
+        packed = _pack(board)
+        if len(self._offsets) % self.keyframe_interval == 0:
+            frame = packed
+        else:
+            frame = packed ^ self._previous
+        self._offsets.append(self._file.tell())
+        self._file.write(zlib.compress(frame.tobytes(), self.level))
+        self._previous = packed
+
+    def close(self):
+        """Write the frame index and finish the file."""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(np.array(self._offsets + [index_offset], dtype="<u8").tobytes())
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, self.shape[0], self.shape[1], self.keyframe_interval,
+                                     len(self._offsets), index_offset))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RecordingPlayer:
+    """
+    Memory-mapped playback of a recording.
+
+    The player has the same interface as the simulation engines (step,
+    to_dense, population), so main() can run from a recording; stepping past
+    the last recorded generation keeps showing the last one.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, height, width, interval, count, index_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Life recording")
+        if count == 0:
+            raise ValueError(f"{path} contains no generations")
+        self.shape = (height, width)
+        self.keyframe_interval = interval
+        self.frame_count = count
+        self._offsets = np.frombuffer(self._map, dtype="<u8", count=count + 1, offset=index_offset)
+        # Decoded packed board of the current generation
+        self.generation = -1
+        self._packed = None
+        self.seek(0)
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    def _frame(self, index: int) -> np.array:
+        start, stop = int(self._offsets[index]), int(self._offsets[index + 1])
+        return np.frombuffer(zlib.decompress(self._map[start:stop]), dtype=np.uint8)
+
+    def seek(self, generation: int):
+        """Move to the given generation (clamped to the recorded range)."""
+        generation = min(max(generation, 0), self.frame_count - 1)
+        keyframe = generation - generation % self.keyframe_interval
+        # Continue from the current state if it is in the same keyframe block and not ahead
+        if self._packed is None or not keyframe <= self.generation <= generation:
+            self._packed = self._frame(keyframe).copy()
+            self.generation = keyframe
+        while self.generation < generation:
+            self.generation += 1
+            self._packed ^= self._frame(self.generation)
+
+    def frame(self, generation: int) -> np.array:
+        """Return the board at the given generation as a 2D uint8 array."""
+        self.seek(generation)
+        return self.to_dense()
+
+    def step(self, generations: int = 1):
+        """Advance playback by the given number of generations."""
+        self.seek(self.generation + generations)
+
+    def to_dense(self) -> np.array:
+        """Return the current board as a 2D uint8 array (0 - dead, 1 - alive)."""
+        height, width = self.shape
+        return np.unpackbits(self._packed, count=height * width).reshape(height, width)
+
+    def population(self) -> int:
+        """Return the number of live cells."""
+        return int(np.unpackbits(self._packed).sum(dtype=np.int64))
+
+    def close(self):
+        """Release the memory map."""
+        self._offsets = None
+        self._map.close()
+        self._file.close()
+
+
+def record_run(engine, path: str, generations: int, keyframe_interval: int = 64):
+    """Record the current board of an engine and the given number of following generations."""
+    with Recorder(path, engine.to_dense().shape, keyframe_interval) as recorder:
+        recorder.write(engine.to_dense())
+        for _ in range(generations):
+            engine.step()
+            recorder.write(engine.to_dense())
@@ -0,0 +1,41 @@
+"""Tests for the batched Life ensemble (run with `python -m pytest` from lab1)."""
+
+import numpy as np
+
+from ensemble import Ensemble
+
+
+def boards():
+    """A blinker, a board that dies after one generation and an empty board."""
+    blinker = np.zeros((8, 8), dtype=np.uint8)
+    blinker[3, 2:5] = 1
+    single = np.zeros((8, 8), dtype=np.uint8)
+    single[4, 4] = 1
+    return np.stack([blinker, single, np.zeros((8, 8), dtype=np.uint8)])
+
+
+def test_run_records_populations_and_extinction():
+    result = Ensemble.from_dense(boards()).run(3)
+    assert result["populations"].tolist() == [[3, 3, 3, 3], [1, 0, 0, 0], [0, 0, 0, 0]]
+    assert result["extinction"].tolist() == [-1, 1, 0]
+
+
+def test_run_twice_after_boards_died_out():
+    ensemble = Ensemble.from_dense(boards())
+    ensemble.run(2)
+    assert ensemble.ids.tolist() == [0]
+
+    result = ensemble.run(2)
+    assert result["populations"].shape == (3, 3)
+    assert result["populations"].tolist() == [[3, 3, 3], [0, 0, 0], [0, 0, 0]]
+    assert result["extinction"].tolist() == [-1, 0, 0]
+    assert ensemble.generation == 4
+
+
+def test_run_twice_on_random_soups():
+    ensemble = Ensemble.random(50, 16, 16, density=0.05, seed=1)
+    first = ensemble.run(40)
+    assert (first["extinction"] >= 0).any()
+    second = ensemble.run(40)
+    assert second["populations"].shape == (50, 41)
+    assert (second["extinction"][first["extinction"] >= 0] == 0).all()
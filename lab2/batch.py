@@ -0,0 +1,188 @@
+"""
+Пакетна генерація та розв'язання лабіринтів на пулі процесів.
+
+Кожне завдання отримує власне зерно, виведене з базового зерна та номера
+лабіринту (numpy SeedSequence), тож набір даних однаковий за будь-якої
+кількості процесів. Робочі процеси повертають уже закодовані записи, а
+головний процес дописує їх у єдиний файл пачками.
+
+Структура файлу (little-endian):
+
+    заголовок  magic, width, height, кількість, ймовірність додаткових
+               проходів, зміщення індексу, назви генератора та розв'язувача
+    записи     на кожен лабіринт: seed, вхід, вихід, довжина шляху (0 - шляху
+               немає), розкрито клітинок; стіни по дві клітинки на байт;
+               ходи шляху від входу по 2 біти (N, S, E, W)
+    індекс     uint64 зміщення кожного запису та зміщення самого індексу
+
+Приклад: python batch.py 32 32 10000 --workers 8 --output mazes.bin
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from generators import GENERATORS
+from maze import Maze, N, S, E, W, DX, DY
+from solvers import SOLVERS
+from storage import pack_nibbles, unpack_nibbles
+
+MAGIC = b"MAZEBAT1"
+HEADER = struct.Struct("<8sIIIdQ16s16s")
+RECORD = struct.Struct("<QIIBIIBII")
+# Код ходу (2 біти) -> стіна, через яку він проходить
+MOVES = (N, S, E, W)
+
+
+def task_seed(seed, index):
+    """Зерно index-го лабіринту пачки з базовим зерном seed."""
+    return int(np.random.SeedSequence([seed, index]).generate_state(1, np.uint64)[0] >> np.uint64(1))
+
+
+def pack_path(path):
+    """Кодує шлях як ходи між сусідніми клітинками, по 2 біти на хід."""
+    codes = [MOVES.index(next(wall for wall in MOVES if x + DX[wall] == nx and y + DY[wall] == ny))
+             for (x, y), (nx, ny) in zip(path, path[1:])]
+    codes += [0] * (-len(codes) % 4)
+    codes = np.array(codes, dtype=np.uint8).reshape(-1, 4)
+    return (codes[:, 0] | codes[:, 1] << 2 | codes[:, 2] << 4 | codes[:, 3] << 6).astype(np.uint8).tobytes()
+
+
+def unpack_path(data, start, length):
+    """Відновлює шлях з length клітинок з ходів, закодованих pack_path."""
+    packed = np.frombuffer(data, dtype=np.uint8)
+    codes = np.stack([packed >> shift & 3 for shift in (0, 2, 4, 6)], axis=1).ravel()
+    path = [start]
+    for code in codes[:length - 1].tolist():
+        x, y = path[-1]
+        wall = MOVES[code]
+        path.append((x + DX[wall], y + DY[wall]))
+    return path
+
+
+def run_task(task):
+    """Генерує і розв'язує один лабіринт; повертає закодований запис."""
+    width, height, prob, generator, solver, seed = task
+    maze = Maze(width, height, prob, seed)
+    maze.generate_maze(generator)
+    maze.add_extra_passages()
+    result = maze.solve(solver)
+    path = result["path"] or []
+    record = RECORD.pack(seed, *maze.entrance, *maze.exit, len(path), result["nodes_expanded"])
+    return record + pack_nibbles(maze.maze).tobytes() + (pack_path(path) if path else b"")
+
+
+def run_batch(output, width, height, count, prob=0.1, generator="dfs", solver="bfs",
+              seed=0, workers=None, chunk=256):
+    """
+    Генерує count лабіринтів з розв'язками у файл output.
+
+    workers - кількість процесів (None - os.cpu_count(), 1 - без пулу)
+    chunk   - скільки записів передається робочому процесу і дописується за раз
+    Повертає словник з кількістю лабіринтів, часом і пропускною здатністю.
+    """
+    if generator not in GENERATORS:
+        raise ValueError(f"Невідомий генератор {generator!r}, доступні: {', '.join(GENERATORS)}")
+    if solver not in SOLVERS:
+        raise ValueError(f"Невідомий алгоритм {solver!r}, доступні: {', '.join(SOLVERS)}")
+    workers = workers or os.cpu_count()
+    tasks = ((width, height, prob, generator, solver, task_seed(seed, index)) for index in range(count))
+
+    started = time.perf_counter()
+    offsets = []
+    with open(output, "wb") as file:
+        file.write(HEADER.pack(MAGIC, width, height, 0, prob, 0, generator.encode(), solver.encode()))
+        pool = Pool(workers) if workers > 1 else None
+        try:
+            records = pool.imap(run_task, tasks, chunksize=chunk) if pool else map(run_task, tasks)
+            pending = []
+            position = file.tell()
+            for record in records:
+                offsets.append(position)
+                position += len(record)
+                pending.append(record)
+                if len(pending) >= chunk:
+                    file.write(b"".join(pending))
+                    pending = []
+            file.write(b"".join(pending))
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+        index_offset = file.tell()
+        file.write(np.array(offsets + [index_offset], dtype="<u8").tobytes())
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, width, height, count, prob, index_offset, generator.encode(), solver.encode()))
+    elapsed = time.perf_counter() - started
+    return {"count": count, "workers": workers, "time": elapsed, "mazes_per_sec": count / elapsed if elapsed else None}
+
+
+class BatchReader:
+    """Читання файлу пачки через mmap: лабіринт з розв'язком за номером за O(1)."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, width, height, count, prob, index_offset, generator, solver = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} не є файлом пачки лабіринтів")
+        self.width, self.height = width, height
+        self.extra_passage_prob = prob
+        self.generator = generator.rstrip(b"\0").decode()
+        self.solver = solver.rstrip(b"\0").decode()
+        self.count = count
+        self._offsets = np.frombuffer(self._map, dtype="<u8", count=count + 1, offset=index_offset)
+        self._walls_size = (width * height + 1) // 2
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """Повертає (Maze, шлях або None, розкрито клітинок) для лабіринту index."""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        start, stop = int(self._offsets[index]), int(self._offsets[index + 1])
+        seed, ex, ey, entrance_wall, xx, xy, exit_wall, length, expanded = RECORD.unpack_from(self._map, start)
+        walls_start = start + RECORD.size
+        packed = np.frombuffer(self._map, dtype=np.uint8, count=self._walls_size, offset=walls_start)
+        walls = unpack_nibbles(packed, self.height, self.width)
+        maze = Maze.from_array(walls, (ex, ey, entrance_wall), (xx, xy, exit_wall), self.extra_passage_prob, seed)
+        path = None
+        if length:
+            path = unpack_path(self._map[walls_start + self._walls_size:stop], (ex, ey), length)
+        return maze, path, expanded
+
+    def close(self):
+        """Звільняє memory map."""
+        self._offsets = None
+        self._map.close()
+        self._file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетна генерація та розв'язання лабіринтів")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("count", type=int, help="кількість лабіринтів")
+    parser.add_argument("--prob", type=float, default=0.1, help="ймовірність додаткового проходу")
+    parser.add_argument("--generator", choices=GENERATORS, default="dfs")
+    parser.add_argument("--solver", choices=SOLVERS, default="bfs")
+    parser.add_argument("--seed", type=int, default=0, help="базове зерно пачки")
+    parser.add_argument("--workers", type=int, default=None, help="кількість процесів (за замовчуванням - усі ядра)")
+    parser.add_argument("--chunk", type=int, default=256, help="розмір пачки завдань і запису")
+    parser.add_argument("--output", default="mazes.bin")
+    args = parser.parse_args()
+
+    result = run_batch(args.output, args.width, args.height, args.count, args.prob, args.generator,
+                       args.solver, args.seed, args.workers, args.chunk)
+    print(f"{args.output}: {result['count']} лабіринтів за {result['time']:.2f} с "
+          f"({result['mazes_per_sec']:.0f} лабіринтів/с, процесів: {result['workers']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Headless-бенчмарк генераторів і розв'язувачів лабіринтів (без pygame і затримок).
+
+    python bench.py run --generator kruskal --size 1000 --prob 0.1 --seed 1
+    python bench.py suite --sizes 10 100 1000 4000 --probs 0 0.1 --output results.json
+
+Кожен замір - окремий рядок JSON: фаза (generate, passages, solve), алгоритм,
+час, пік пам'яті та (для розв'язувачів) кількість розкритих клітинок і
+довжина шляху. Пік пам'яті - приріст піку RSS процесу за фазу: на Linux пік
+скидається записом у /proc/self/clear_refs, тож заміри не сповільнюються.
+Деінде використовується tracemalloc, який помітно сповільнює цикли Python
+(поле memory_method показує, який спосіб використано).
+
+Перед замірами всі алгоритми один раз проганяються на малому лабіринті
+(warm_up), щоб у пік фази не потрапляли одноразові витрати (ініціалізація
+генераторів numpy, кеші модулів), а з кожного піку віднімається пік порожньої
+фази. Навіть так приріст RSS змінюється сторінками і може бути заниженим, якщо
+фаза повторно використала пам'ять, звільнену попередньою, але ще не повернуту
+системі: цифри змістовні лише для великих лабіринтів (від сотень тисяч
+клітинок), для малих це здебільшого шум.
+
+Генератори з SIZE_LIMITS (повільні цикли Python) у suite пропускаються на
+розмірах, більших за їхню межу.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from generators import GENERATORS
+from maze import Maze
+from solvers import SOLVERS
+
+WARM_UP_SIZE = 16
+# Найбільший розмір лабіринту для генератора в suite (wilson на 1000x1000 - секунди, далі - надто довго)
+SIZE_LIMITS = {"wilson": 1000}
+
+
+def _read_status(field):
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    raise OSError(f"{field} недоступне")
+
+
+class MemoryMeter:
+    """Пік пам'яті однієї фази: приріст піку RSS (Linux) або пік tracemalloc."""
+
+    def __init__(self):
+        try:
+            self._reset_peak()
+            _read_status("VmHWM")
+            self.method = "rss"
+        except OSError:
+            self.method = "tracemalloc"
+        self._baseline = 0
+        self.noise = 0
+
+    @staticmethod
+    def _reset_peak():
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+
+    def start(self):
+        if self.method == "rss":
+            self._reset_peak()
+            self._baseline = _read_status("VmRSS")
+        else:
+            tracemalloc.start()
+
+    def stop(self):
+        """Повертає пік пам'яті фази в байтах (без шуму порожньої фази)."""
+        if self.method == "rss":
+            peak = _read_status("VmHWM") - self._baseline
+        else:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        return max(peak - self.noise, 0)
+
+    def calibrate(self, repeats=5):
+        """Вимірює пік порожньої фази; він віднімається від наступних замірів."""
+        self.noise = 0
+        peaks = []
+        for _ in range(repeats):
+            self.start()
+            peaks.append(self.stop())
+        self.noise = max(peaks)
+        return self.noise
+
+
+def _measure(meter, function, *args):
+    meter.start()
+    started = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - started
+    return result, elapsed, meter.stop()
+
+
+def run_case(width, height, prob=0.1, generator="dfs", solvers=tuple(SOLVERS), seed=0, meter=None):
+    """
+    Генерує один лабіринт, додає проходи і розв'язує його кожним розв'язувачем.
+
+    Повертає список словників (по одному на фазу) з параметрами та результатами замірів.
+    """
+    meter = meter or MemoryMeter()
+    common = {"width": width, "height": height, "prob": prob, "seed": seed, "memory_method": meter.method}
+    results = []
+
+    maze = Maze(width, height, prob, seed)
+    _, elapsed, peak = _measure(meter, maze.generate_maze, generator)
+    results.append({"phase": "generate", "algorithm": generator, **common,
+                    "seconds": elapsed, "cells_per_sec": width * height / elapsed if elapsed else None,
+                    "peak_memory_bytes": peak})
+
+    _, elapsed, peak = _measure(meter, maze.add_extra_passages)
+    results.append({"phase": "passages", "algorithm": "vectorized", **common,
+                    "seconds": elapsed, "peak_memory_bytes": peak})
+
+    for solver in solvers:
+        result, elapsed, peak = _measure(meter, maze.solve, solver)
+        results.append({"phase": "solve", "algorithm": solver, "generator": generator, **common,
+                        "seconds": elapsed, "search_seconds": result["time"], "peak_memory_bytes": peak,
+                        "nodes_expanded": result["nodes_expanded"],
+                        "path_length": len(result["path"]) if result["path"] else None})
+    return results
+
+
+def warm_up(generators, solvers, meter):
+    """Проганяє всі алгоритми на малому лабіринті (результати відкидаються) і калібрує meter."""
+    for generator in generators:
+        run_case(WARM_UP_SIZE, WARM_UP_SIZE, 0.1, generator, solvers, meter=meter)
+    meter.calibrate()
+
+
+def run_suite(generators, solvers, sizes, probs, seed=0, limits=SIZE_LIMITS):
+    """
+    Повертає (генератором) заміри run_case для кожної комбінації розміру, ймовірності та генератора.
+    Генератор пропускається на розмірах, більших за його межу в limits.
+    """
+    meter = MemoryMeter()
+    warm_up(generators, solvers, meter)
+    for size in sizes:
+        for prob in probs:
+            for generator in generators:
+                if size <= limits.get(generator, size):
+                    yield from run_case(size, size, prob, generator, solvers, seed, meter)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк генераторів і розв'язувачів лабіринтів")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="заміри для одного лабіринту")
+    run.add_argument("--generator", choices=GENERATORS, default="dfs")
+    run.add_argument("--solvers", nargs="+", choices=SOLVERS, default=list(SOLVERS))
+    run.add_argument("--size", type=int, default=100)
+    run.add_argument("--prob", type=float, default=0.1)
+    run.add_argument("--seed", type=int, default=0)
+
+    suite = commands.add_parser("suite", help="матриця розмірів, ймовірностей і алгоритмів")
+    suite.add_argument("--generators", nargs="+", choices=GENERATORS, default=list(GENERATORS))
+    suite.add_argument("--solvers", nargs="+", choices=SOLVERS, default=list(SOLVERS))
+    suite.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 4000])
+    suite.add_argument("--probs", type=float, nargs="+", default=[0.0, 0.1, 0.3])
+    suite.add_argument("--seed", type=int, default=0)
+    suite.add_argument("--output", help="також записати всі результати одним документом JSON")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        meter = MemoryMeter()
+        warm_up([args.generator], args.solvers, meter)
+        for result in run_case(args.size, args.size, args.prob, args.generator, args.solvers, args.seed, meter):
+            print(json.dumps(result))
+        return
+
+    results = []
+    for result in run_suite(args.generators, args.solvers, args.sizes, args.probs, args.seed):
+        results.append(result)
+        print(json.dumps(result), flush=True)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "python": sys.version.split()[0],
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "results": results,
+            }, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Поле відстаней до виходу та індекс наступного ходу для лабіринту Maze.
+
+Індекс будується один раз пошуком у ширину від виходу: для кожної клітинки
+зберігається відстань до виходу (int32, -1 - вихід недосяжний) і напрямок
+наступного ходу до виходу (біт N, S, E або W; 0 для самого виходу та
+недосяжних клітинок). Після цього відстань і наступний хід з будь-якої
+клітинки - O(1), а шлях до виходу - O(довжина шляху), без жодного пошуку.
+
+BFS іде рівнями: широкий фронт розкривається векторно (numpy, по масці
+проходів для кожного напрямку), вузький - звичайним циклом, бо в досконалому
+лабіринті рівнів сотні тисяч і накладні витрати numpy на рівень переважили б.
+Обидва режими пишуть у ті самі буфери через np.frombuffer.
+
+Індекс зберігається поруч з файлом лабіринту як два .npy (FILE.dist.npy,
+FILE.next.npy) і відкривається через memmap.
+"""
+
+from array import array
+
+import numpy as np
+
+from maze import N, S, E, W, DX, DY, OPPOSITE
+from solvers import open_moves
+
+# Фронт, менший за цей розмір, розкривається циклом Python
+VECTOR_FRONTIER = 128
+
+
+def index_paths(path):
+    """Імена файлів індексу для файлу лабіринту path."""
+    return path + ".dist.npy", path + ".next.npy"
+
+
+class DistanceIndex:
+    """Відстані до виходу та наступні ходи для всіх клітинок лабіринту."""
+
+    def __init__(self, distance, next_hop):
+        """
+        distance  - масив height x width з відстанями до виходу (-1 - недосяжно)
+        next_hop  - масив height x width з напрямком наступного ходу (0 - немає)
+        """
+        self.distance_field = distance
+        self.next_hop = next_hop
+        self.height, self.width = distance.shape
+
+    @classmethod
+    def build(cls, maze):
+        """Будує індекс BFS від виходу лабіринту."""
+        width, size = maze.width, maze.width * maze.height
+        moves_bytes = open_moves(maze)
+        moves = np.frombuffer(moves_bytes, dtype=np.uint8)
+        distance_buffer = array("i", [-1]) * size
+        distance = np.frombuffer(distance_buffer, dtype=np.int32)
+        next_buffer = bytearray(size)
+        next_hop = np.frombuffer(next_buffer, dtype=np.uint8)
+
+        # (біт проходу, зміщення індексу, напрямок назад до клітинки фронту)
+        directions = tuple((wall, DY[wall] * width + DX[wall], OPPOSITE[wall]) for wall in (N, S, E, W))
+        table = [tuple((offset, back) for wall, offset, back in directions if mask & wall) for mask in range(16)]
+
+        goal = maze.exit[1] * width + maze.exit[0]
+        distance_buffer[goal] = 0
+        frontier = [goal]
+        level = 0
+        while len(frontier):
+            level += 1
+            if len(frontier) < VECTOR_FRONTIER:
+                following = []
+                for current in (frontier.tolist() if isinstance(frontier, np.ndarray) else frontier):
+                    for offset, back in table[moves_bytes[current]]:
+                        cell = current + offset
+                        if distance_buffer[cell] < 0:
+                            distance_buffer[cell] = level
+                            next_buffer[cell] = back
+                            following.append(cell)
+                frontier = following
+            else:
+                frontier = np.asarray(frontier)
+                parts = []
+                for wall, offset, back in directions:
+                    cells = frontier[(moves[frontier] & wall) != 0] + offset
+                    cells = cells[distance[cells] < 0]
+                    distance[cells] = level
+                    next_hop[cells] = back
+                    parts.append(cells)
+                frontier = np.concatenate(parts)
+
+        shape = (maze.height, maze.width)
+        return cls(distance.reshape(shape).copy(), next_hop.reshape(shape).copy())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Відкриває індекс, збережений save(path) (через memmap, якщо mmap)."""
+        distance_path, next_path = index_paths(path)
+        mode = "r" if mmap else None
+        return cls(np.load(distance_path, mmap_mode=mode), np.load(next_path, mmap_mode=mode))
+
+    def save(self, path):
+        """Зберігає індекс поруч з файлом лабіринту path."""
+        distance_path, next_path = index_paths(path)
+        np.save(distance_path, self.distance_field)
+        np.save(next_path, self.next_hop)
+
+    def distance(self, x, y):
+        """Кількість кроків від клітинки до виходу або None, якщо вихід недосяжний."""
+        value = int(self.distance_field[y, x])
+        return None if value < 0 else value
+
+    def next_move(self, x, y):
+        """Наступна клітинка на найкоротшому шляху до виходу (None для виходу або недосяжної)."""
+        wall = int(self.next_hop[y, x])
+        if not wall:
+            return None
+        return x + DX[wall], y + DY[wall]
+
+    def path(self, x, y):
+        """Найкоротший шлях від клітинки до виходу (список клітинок) або None."""
+        length = self.distance(x, y)
+        if length is None:
+            return None
+        path = [(x, y)]
+        for _ in range(length):
+            path.append(self.next_move(*path[-1]))
+        return path
@@ -0,0 +1,299 @@
+"""
+Алгоритми генерації досконалих лабіринтів для моделі Maze.
+
+Усі генератори пишуть ту саму кодировку стін (біти N, S, E, W) і лише
+прибирають внутрішні стіни, тож прорізи входу та виходу зберігаються.
+Випадковість береться з maze.random, тому лабіринт відтворюється за seed.
+
+  dfs      - рекурсивний бектрекер (ітеративний): довгі коридори
+  kruskal  - алгоритм Крускала з масивом union-find: багато коротких тупиків
+  wilson   - алгоритм Вілсона (випадкові блукання зі стиранням петель):
+             рівномірно розподілене кістякове дерево
+  eller    - алгоритм Еллера: рядок за рядком з пам'яттю O(width); eller_rows()
+             віддає рядки по одному, тож лабіринт довільної висоти можна писати
+             одразу у файл (storage.stream_eller)
+
+Якщо в моделі є спостерігачі, для кожної прибраної стіни надсилається
+"generate_step" з current_cell та changed (клітинки, де змінилися стіни).
+"""
+
+import random
+from array import array
+
+import numpy as np
+
+from maze import N, S, E, W
+
+
+class GenerationStopped(Exception):
+    """Спостерігач попросив перервати генерацію."""
+
+
+def _carver(maze, walls):
+    """
+    Повертає функцію carve(current, following) для подій "generate_step" або None
+    без спостерігачів. walls - плоский bytearray стін (індекс y * width + x).
+    """
+    if not maze.observers:
+        return None
+    width = maze.width
+
+    def carve(current, following):
+        cells = []
+        for index in (current, following):
+            y, x = divmod(index, width)
+            maze.maze[y, x] = walls[index]
+            cells.append((x, y))
+        if maze.notify("generate_step", current_cell=cells[1], changed=tuple(cells)):
+            raise GenerationStopped
+    return carve
+
+
+def _store(maze, walls):
+    """Записує плоский bytearray стін у масив моделі."""
+    maze.maze[...] = np.frombuffer(bytes(walls), dtype=np.uint8).reshape(maze.height, maze.width)
+
+
+def dfs(maze):
+    """
+    Ідеальний лабіринт алгоритмом DFS (починаємо з точки входу).
+
+    Ітеративний DFS працює з плоскими масивами, оточеними рамкою з уже
+    "відвіданих" клітинок, тож перевірки меж не потрібні. Клітинка, з якої
+    залишився лише один невідвіданий сусід, не кладеться у стек (повернення
+    до неї нічого не дало б).
+    """
+    width, height = maze.width, maze.height
+    row = width + 2
+    # Плоскі масиви з рамкою в одну клітинку: індекс (y + 1) * row + x + 1
+    padded = np.full((height + 2, row), 15, dtype=np.uint8)
+    padded[1:-1, 1:-1] = maze.maze
+    walls = bytearray(padded.tobytes())
+    padded[...] = 1
+    padded[1:-1, 1:-1] = 0
+    visited = bytearray(padded.tobytes())
+
+    # Маска невідвіданих сусідів (біти N, S, E, W) -> можливі ходи
+    moves = ((-row, N, S), (row, S, N), (1, E, W), (-1, W, E))
+    options = [tuple(moves[i] for i in range(4) if mask >> i & 1) for mask in range(16)]
+
+    observed = bool(maze.observers)
+    x, y, _ = maze.entrance
+    current = (y + 1) * row + x + 1
+    visited[current] = 1
+    stack = array("i")
+    if observed and maze.notify("generate_step", current_cell=(x, y)):
+        raise GenerationStopped
+
+    rand = maze.random.random
+    while True:
+        choices = options[(not visited[current - row]) | (not visited[current + row]) << 1 |
+                          (not visited[current + 1]) << 2 | (not visited[current - 1]) << 3]
+        count = len(choices)
+        if count:
+            offset, wall, opposite = choices[int(rand() * count)] if count > 1 else choices[0]
+            following = current + offset
+            walls[current] &= ~wall
+            walls[following] &= ~opposite
+            visited[following] = 1
+            if count > 1:
+                stack.append(current)
+        elif stack:
+            following = stack.pop()
+        else:
+            break
+
+        if observed:
+            cy, cx = divmod(current, row)
+            maze.maze[cy - 1, cx - 1] = walls[current]
+            fy, fx = divmod(following, row)
+            maze.maze[fy - 1, fx - 1] = walls[following]
+            changed = ((cx - 1, cy - 1), (fx - 1, fy - 1)) if count else ()
+            if maze.notify("generate_step", current_cell=(cx - 1, cy - 1), changed=changed):
+                raise GenerationStopped
+        current = following
+
+    padded = np.frombuffer(bytes(walls), dtype=np.uint8).reshape(height + 2, row)
+    maze.maze[...] = padded[1:-1, 1:-1]
+
+
+def _find(parents, index):
+    """Корінь множини з half-стисненням шляху."""
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+    return index
+
+
+def kruskal(maze):
+    """
+    Алгоритм Крускала: внутрішні стіни перебираються у випадковому порядку, і
+    стіна прибирається, якщо клітинки по обидва боки ще в різних множинах.
+    Множини - масив union-find з об'єднанням за розміром.
+    """
+    width, height = maze.width, maze.height
+    size = width * height
+    walls = bytearray(maze.maze.tobytes())
+    carve = _carver(maze, walls)
+
+    # Стіна кодується як 2 * індекс клітинки + (0 - східна, 1 - південна)
+    cells = np.arange(size, dtype=np.int64).reshape(height, width)
+    edges = np.concatenate((cells[:, :-1].ravel() * 2, cells[:-1, :].ravel() * 2 + 1))
+    np.random.default_rng(maze.random.getrandbits(64)).shuffle(edges)
+
+    parents = array("i", range(size))
+    sizes = array("i", [1]) * size
+    remaining = size - 1
+    for edge in edges.tolist():
+        if not remaining:
+            break
+        current = edge >> 1
+        if edge & 1:
+            following, wall, opposite = current + width, S, N
+        else:
+            following, wall, opposite = current + 1, E, W
+        a, b = _find(parents, current), _find(parents, following)
+        if a == b:
+            continue
+        if sizes[a] < sizes[b]:
+            a, b = b, a
+        parents[b] = a
+        sizes[a] += sizes[b]
+        remaining -= 1
+        walls[current] &= ~wall
+        walls[following] &= ~opposite
+        if carve:
+            carve(current, following)
+    _store(maze, walls)
+
+
+def wilson(maze):
+    """
+    Алгоритм Вілсона: з кожної клітинки поза деревом запускається випадкове
+    блукання до дерева; запам'ятовується лише останній напрямок виходу з
+    кожної клітинки (це і є стирання петель), після чого шлях додається до
+    дерева. Дає рівномірно випадкове кістякове дерево.
+    """
+    width, height = maze.width, maze.height
+    size = width * height
+    walls = bytearray(maze.maze.tobytes())
+    carve = _carver(maze, walls)
+    rand = maze.random.random
+
+    # Маска напрямків у межах лабіринту -> можливі ходи (зміщення, стіна, протилежна)
+    moves = ((-width, N, S), (width, S, N), (1, E, W), (-1, W, E))
+    options = [tuple(moves[i] for i in range(4) if mask >> i & 1) for mask in range(16)]
+    bounds = bytearray(size)
+    for index in range(size):
+        y, x = divmod(index, width)
+        bounds[index] = (y > 0) | (y < height - 1) << 1 | (x < width - 1) << 2 | (x > 0) << 3
+
+    in_tree = bytearray(size)
+    in_tree[int(rand() * size)] = 1
+    # Останній хід з кожної клітинки під час поточного блукання
+    exits = array("i", [0]) * size
+    order = list(range(size))
+    maze.random.shuffle(order)
+    for start in order:
+        current = start
+        while not in_tree[current]:
+            choices = options[bounds[current]]
+            move = int(rand() * len(choices))
+            exits[current] = move
+            current += choices[move][0]
+        current = start
+        while not in_tree[current]:
+            offset, wall, opposite = options[bounds[current]][exits[current]]
+            following = current + offset
+            walls[current] &= ~wall
+            walls[following] &= ~opposite
+            in_tree[current] = 1
+            if carve:
+                carve(current, following)
+            current = following
+    _store(maze, walls)
+
+
+def eller_rows(width, height, rng=None):
+    """
+    Алгоритм Еллера як генератор рядків: віддає height масивів uint8 довжиною
+    width з масками стін (без прорізів входу та виходу). У пам'яті тримаються
+    лише мітки множин поточного рядка, тобто O(width) незалежно від висоти.
+
+    rng - random.Random (None - новий з випадковим зерном)
+    """
+    rng = rng or random.Random()
+    labels = array("i", range(width))
+    next_label = width
+    went_down = None
+    for y in range(height):
+        last = y == height - 1
+        row = np.full(width, 15, dtype=np.uint8)
+        if went_down is not None:
+            row[went_down] &= 15 ^ N
+
+        # Горизонтальні з'єднання: union-find по мітках лише цього рядка
+        parents = {label: label for label in labels}
+
+        def find(label):
+            while parents[label] != label:
+                parents[label] = parents[parents[label]]
+                label = parents[label]
+            return label
+
+        for x in range(width - 1):
+            a, b = find(labels[x]), find(labels[x + 1])
+            if a != b and (last or rng.random() < 0.5):
+                parents[b] = a
+                row[x] &= 15 ^ E
+                row[x + 1] &= 15 ^ W
+        for x in range(width):
+            labels[x] = find(labels[x])
+
+        if last:
+            yield row
+            return
+
+        # Вертикальні з'єднання: кожна множина спускається хоча б в одній клітинці
+        down = np.zeros(width, dtype=bool)
+        members = {}
+        for x in range(width):
+            members.setdefault(labels[x], []).append(x)
+        for cells in members.values():
+            chosen = [x for x in cells if rng.random() < 0.5]
+            for x in chosen or [cells[int(rng.random() * len(cells))]]:
+                down[x] = True
+        row[down] &= 15 ^ S
+        yield row
+
+        # Клітинки без спуску в наступному рядку починають нові множини
+        for x in range(width):
+            if not down[x]:
+                labels[x] = next_label
+                next_label += 1
+        # Перенумерація, щоб мітки лишалися в межах O(width)
+        renumber = {}
+        for x in range(width):
+            labels[x] = renumber.setdefault(labels[x], len(renumber))
+        next_label = len(renumber)
+        went_down = down
+
+
+def eller(maze):
+    """Алгоритм Еллера для лабіринту в пам'яті (рядки з eller_rows)."""
+    width = maze.width
+    for y, row in enumerate(eller_rows(width, maze.height, maze.random)):
+        # Побітове "і" зберігає прорізи входу та виходу
+        maze.maze[y] &= row
+        if maze.observers:
+            if maze.notify("generate_step", current_cell=(0, y), changed=[(x, y) for x in range(width)]):
+                raise GenerationStopped
+
+
+# Назва алгоритму -> функція(maze), що прорізає стіни масиву maze.maze
+GENERATORS = {
+    "dfs": dfs,
+    "kruskal": kruskal,
+    "wilson": wilson,
+    "eller": eller,
+}
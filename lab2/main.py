@@ -1,266 +1,295 @@
+import sys
+
 import pygame
-import numpy as np
-import random
-from collections import deque
 
-# Константи для стін: кожен біт відповідає окремій стіні
-N, S, E, W = 1, 2, 4, 8
-# Зміщення для кожного напрямку (x, y)
-DX = {E: 1, W: -1, N: 0, S: 0}
-DY = {E: 0, W: 0, N: -1, S: 1}
-# Протилежні стіни
-OPPOSITE = {N: S, S: N, E: W, W: E}
+from generators import GENERATORS
+from maze import Maze, N, S, E, W
+from solvers import SOLVERS
+from storage import load
+
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+PURPLE = (128, 0, 128)
+LAVENDER = (200, 170, 230)
+
+
+class MazeView:
+    """
+    Візуалізатор лабіринту на pygame: спостерігач подій моделі Maze.
 
-class Maze:
-    def __init__(self, width, height, cell_size=20, delay=30, extra_passage_prob=0.1):
+    Статичний шар (стіни, рамка, вхід і вихід) малюється один раз на окрему
+    поверхню. Далі на кожному кроці перемальовуються лише клітинки, у яких
+    змінилися стіни, активна клітинка, нове ребро дерева пошуку та змінена
+    частина шляху, а на екран виводяться тільки ці прямокутники
+    (pygame.display.update), тож вартість кадру не залежить від розміру
+    лабіринту.
+    """
+
+    def __init__(self, maze, cell_size=20, delay=30):
         """
-        width, height       - розмір лабіринту (кількість клітинок по горизонталі та вертикалі)
+        maze                - модель лабіринту (Maze)
         cell_size           - розмір клітинки у пікселях
         delay               - затримка між кроками візуалізації (у мілісекундах)
-        extra_passage_prob  - ймовірність додаткового проходу (для створення циклів)
         """
-        self.width = width
-        self.height = height
+        self.maze = maze
+        self.width = maze.width
+        self.height = maze.height
         self.cell_size = cell_size
         self.delay = delay
-        self.extra_passage_prob = extra_passage_prob
-
-        # Кожна клітинка спочатку має всі 4 стіни (бітова маска 15)
-        self.maze = np.full((height, width), 15, dtype=np.int32)
-        # Масив для відстеження відвіданих клітинок при генерації
-        self.visited = np.zeros((height, width), dtype=bool)
-
-        # Визначення кандидатів для входу/виходу – це клітинки на межі лабіринту
-        border_candidates = {}
-        for y in range(height):
-            for x in range(width):
-                if x == 0 or x == width - 1 or y == 0 or y == height - 1:
-                    possible_walls = []
-                    if y == 0:
-                        possible_walls.append(N)
-                    if y == height - 1:
-                        possible_walls.append(S)
-                    if x == 0:
-                        possible_walls.append(W)
-                    if x == width - 1:
-                        possible_walls.append(E)
-                    border_candidates[(x, y)] = possible_walls
-
-        candidate_cells = list(border_candidates.keys())
-        # Випадковий вибір входу та видалення однієї з зовнішніх стін
-        entrance_cell = random.choice(candidate_cells)
-        candidate_cells.remove(entrance_cell)
-        # Випадковий вибір виходу (якщо є інший кандидат)
-        exit_cell = random.choice(candidate_cells) if candidate_cells else entrance_cell
-
-        entrance_wall = random.choice(border_candidates[entrance_cell])
-        exit_wall = random.choice(border_candidates[exit_cell])
-
-        self.maze[entrance_cell[1], entrance_cell[0]] &= ~entrance_wall
-        self.maze[exit_cell[1], exit_cell[0]] &= ~exit_wall
-
-        self.entrance = (entrance_cell[0], entrance_cell[1], entrance_wall)
-        self.exit = (exit_cell[0], exit_cell[1], exit_wall)
 
         # Ініціалізація pygame
         pygame.init()
-        self.screen = pygame.display.set_mode((width * cell_size, height * cell_size))
+        size = (self.width * cell_size, self.height * cell_size)
+        self.screen = pygame.display.set_mode(size)
         pygame.display.set_caption("Генерація лабіринту")
         self.clock = pygame.time.Clock()
+        # Прапорець закритого вікна: після нього події моделі ігноруються
+        self.closed = False
+
+        # Статичний шар зі стінами та поточний стан накладок (активна клітинка і шлях)
+        self.layer = pygame.Surface(size)
+        self.current_cell = None
+        self.path = []
+        self.path_index = {}
+        # Дерево пошуку: клітинка -> клітинка, з якої її досягнуто
+        self.tree = {}
+        self.draw_maze()
+        maze.subscribe(self)
 
-    def draw_maze(self, current_cell=None, path=None):
+    def __call__(self, event, maze, current_cell=None, path=None, changed=None, parent=None):
         """
-        Малює лабіринт:
-          - Внутрішні стіни (тонкими лініями)
-          - Товста обводка зовнішніх стін з прорізами для входу та виходу
-          - Вхід (зелений) та вихід (синій)
-          - Якщо current_cell задана, вона виділяється червоним прямокутником
-          - Якщо path задано (послідовність клітинок), малюється шлях лінією (фіолетовим)
+        Обробляє подію моделі: оновлює змінені клітинки і робить паузу між кроками.
+        changed - клітинки, у яких змінилися стіни (None - будь-які, перемалювати все).
+        parent  - клітинка, з якої пошук досягнув current_cell (нове ребро дерева пошуку).
+        Повертає True, якщо вікно закрито (модель перериває поточну операцію).
         """
-        self.screen.fill((255, 255, 255))
-        for y in range(self.height):
-            for x in range(self.width):
-                cell = self.maze[y, x]
-                x1, y1 = x * self.cell_size, y * self.cell_size
-                if cell & N:
-                    pygame.draw.line(self.screen, (0, 0, 0), (x1, y1), (x1 + self.cell_size, y1), 2)
-                if cell & S:
-                    pygame.draw.line(self.screen, (0, 0, 0), (x1, y1 + self.cell_size), (x1 + self.cell_size, y1 + self.cell_size), 2)
-                if cell & E:
-                    pygame.draw.line(self.screen, (0, 0, 0), (x1 + self.cell_size, y1), (x1 + self.cell_size, y1 + self.cell_size), 2)
-                if cell & W:
-                    pygame.draw.line(self.screen, (0, 0, 0), (x1, y1), (x1, y1 + self.cell_size), 2)
+        if self.closed:
+            return True
+        for pg_event in pygame.event.get():
+            if pg_event.type == pygame.QUIT:
+                pygame.quit()
+                self.closed = True
+                return True
+
+        if event == "passages_added":
+            self.draw_maze(current_cell=current_cell, path=path)
+        else:
+            self.update(changed or (), current_cell, path, parent)
+        if event in ("generate_step", "solve_step"):
+            pygame.time.delay(self.delay)
+            self.clock.tick(60)
+        return False
 
-        # Позначення входу (зелений) та виходу (синій)
-        ex, ey, _ = self.entrance
-        entrance_center = (ex * self.cell_size + self.cell_size // 2,
-                           ey * self.cell_size + self.cell_size // 2)
-        pygame.draw.circle(self.screen, (0, 255, 0), entrance_center, self.cell_size // 4)
+    def cell_rect(self, x, y):
+        """Прямокутник клітинки у пікселях."""
+        return pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
 
-        ex, ey, _ = self.exit
-        exit_center = (ex * self.cell_size + self.cell_size // 2,
-                       ey * self.cell_size + self.cell_size // 2)
-        pygame.draw.circle(self.screen, (0, 0, 255), exit_center, self.cell_size // 4)
+    def dirty_rect(self, x, y):
+        """
+        Прямокутник, який треба оновити при зміні клітинки: лінії стін завтовшки
+        2 пікселі виходять на 1-2 пікселі за межі клітинки.
+        """
+        return self.cell_rect(x, y).inflate(4, 4).clip(self.screen.get_rect())
 
-        # Виділення активної клітинки
-        if current_cell:
-            cx, cy = current_cell
-            rect = (cx * self.cell_size + 2, cy * self.cell_size + 2, self.cell_size - 4, self.cell_size - 4)
-            pygame.draw.rect(self.screen, (255, 0, 0), rect)
+    def cell_center(self, cell):
+        x, y = cell
+        return (x * self.cell_size + self.cell_size // 2, y * self.cell_size + self.cell_size // 2)
 
-        # Якщо задано шлях, малюємо його (з'єднуємо центри клітинок)
-        if path and len(path) > 1:
-            points = [(x * self.cell_size + self.cell_size // 2, y * self.cell_size + self.cell_size // 2) for x, y in path]
-            pygame.draw.lines(self.screen, (128, 0, 128), False, points, 4)
+    def segment_rect(self, cell, neighbor, thick=4):
+        """
+        Відрізок завтовшки thick пікселів між центрами сусідніх клітинок. Він
+        завжди горизонтальний або вертикальний, тому малюється прямокутником:
+        товста pygame.draw.line з обрізанням губиться, якщо її вісь поза обрізанням.
+        """
+        (x1, y1), (x2, y2) = self.cell_center(cell), self.cell_center(neighbor)
+        half = thick // 2
+        return pygame.Rect(min(x1, x2) - half, min(y1, y2) - half, abs(x2 - x1) + thick, abs(y2 - y1) + thick)
+
+    def draw_cell_walls(self, surface, x, y):
+        """Малює стіни однієї клітинки (тонкими лініями)."""
+        cell = self.maze.maze[y, x]
+        x1, y1 = x * self.cell_size, y * self.cell_size
+        x2, y2 = x1 + self.cell_size, y1 + self.cell_size
+        if cell & N:
+            pygame.draw.line(surface, BLACK, (x1, y1), (x2, y1), 2)
+        if cell & S:
+            pygame.draw.line(surface, BLACK, (x1, y2), (x2, y2), 2)
+        if cell & E:
+            pygame.draw.line(surface, BLACK, (x2, y1), (x2, y2), 2)
+        if cell & W:
+            pygame.draw.line(surface, BLACK, (x1, y1), (x1, y2), 2)
+
+    def draw_decorations(self, surface):
+        """
+        Малює вхід (зелений) та вихід (синій), товсту обводку зовнішніх стін
+        і прорізи в ній для входу та виходу.
+        """
+        half = self.cell_size // 2
+        for (x, y, _), color in ((self.maze.entrance, GREEN), (self.maze.exit, BLUE)):
+            pygame.draw.circle(surface, color, (x * self.cell_size + half, y * self.cell_size + half),
+                               self.cell_size // 4)
 
-        # Товста обводка зовнішніх стін
         border_thick = 4
         maze_width_px = self.width * self.cell_size
         maze_height_px = self.height * self.cell_size
-        pygame.draw.rect(self.screen, (0, 0, 0), (0, 0, maze_width_px, maze_height_px), border_thick)
+        # Рамка малюється чотирма смугами: товстий pygame.draw.rect з обрізанням
+        # (set_clip) зафарбовує весь прямокутник обрізання
+        for side in ((0, 0, maze_width_px, border_thick),
+                     (0, maze_height_px - border_thick, maze_width_px, border_thick),
+                     (0, 0, border_thick, maze_height_px),
+                     (maze_width_px - border_thick, 0, border_thick, maze_height_px)):
+            surface.fill(BLACK, side)
 
         # Прорізи в зовнішній рамці для входу та виходу
-        def make_gap(cell_info):
-            x, y, wall = cell_info
+        for x, y, wall in (self.maze.entrance, self.maze.exit):
             if wall == N:
-                return (x * self.cell_size, 0, self.cell_size, border_thick)
+                gap = (x * self.cell_size, 0, self.cell_size, border_thick)
             elif wall == S:
-                return (x * self.cell_size, maze_height_px - border_thick, self.cell_size, border_thick)
+                gap = (x * self.cell_size, maze_height_px - border_thick, self.cell_size, border_thick)
             elif wall == W:
-                return (0, y * self.cell_size, border_thick, self.cell_size)
-            elif wall == E:
-                return (maze_width_px - border_thick, y * self.cell_size, border_thick, self.cell_size)
-            return None
-
-        for cell in [self.entrance, self.exit]:
-            gap = make_gap(cell)
-            if gap:
-                pygame.draw.rect(self.screen, (255, 255, 255), gap)
-
-        pygame.display.flip()
-
-    def generate_maze(self):
-        """Генерує лабіринт ідеальним алгоритмом DFS (починаємо з точки входу)."""
-        x, y, _ = self.entrance
-        self.visited[y, x] = True
-        stack = [(x, y)]
-        self.draw_maze(current_cell=(x, y))
-
-        while stack:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return
-
-            cx, cy = stack[-1]
-            neighbors = []
-            for direction in [N, S, E, W]:
-                nx = cx + DX[direction]
-                ny = cy + DY[direction]
-                if 0 <= nx < self.width and 0 <= ny < self.height and not self.visited[ny, nx]:
-                    neighbors.append((nx, ny, direction))
-            if neighbors:
-                nx, ny, direction = random.choice(neighbors)
-                self.maze[cy, cx] &= ~direction
-                self.maze[ny, nx] &= ~OPPOSITE[direction]
-                self.visited[ny, nx] = True
-                stack.append((nx, ny))
+                gap = (0, y * self.cell_size, border_thick, self.cell_size)
             else:
-                stack.pop()
+                gap = (maze_width_px - border_thick, y * self.cell_size, border_thick, self.cell_size)
+            pygame.draw.rect(surface, WHITE, gap)
 
-            self.draw_maze(current_cell=(cx, cy))
-            pygame.time.delay(self.delay)
-            self.clock.tick(60)
-        self.draw_maze()
-
-    def add_extra_passages(self):
-        """Додає додаткові проходи (цикли) всередині лабіринту для створення альтернативних шляхів."""
-        for y in range(1, self.height - 1):
-            for x in range(1, self.width - 1):
-                for direction in [N, S, E, W]:
-                    nx = x + DX[direction]
-                    ny = y + DY[direction]
-                    if 0 < nx < self.width - 1 and 0 < ny < self.height - 1:
-                        if self.maze[y, x] & direction:
-                            if random.random() < self.extra_passage_prob:
-                                self.maze[y, x] &= ~direction
-                                self.maze[ny, nx] &= ~OPPOSITE[direction]
-        self.draw_maze()
+    def render_layer(self):
+        """Повністю перемальовує статичний шар (один раз або після масових змін стін)."""
+        self.layer.fill(WHITE)
+        for y in range(self.height):
+            for x in range(self.width):
+                self.draw_cell_walls(self.layer, x, y)
+        self.draw_decorations(self.layer)
 
-    def solve_maze_bfs(self):
+    def refresh_layer_cell(self, x, y):
         """
-        Знаходить найкоротший шлях у лабіринті (від точки входу до виходу) за допомогою алгоритму BFS.
-        Процес пошуку візуалізується: на кожному кроці відображається активна клітинка та реконструйований шлях.
+        Перемальовує на статичному шарі одну клітинку (з краєм у 2 пікселі). Стіни
+        сусідніх клітинок заходять у цей прямокутник, тому малюються стіни всього
+        блоку 3x3 з обрізанням.
         """
-        start = (self.entrance[0], self.entrance[1])
-        goal = (self.exit[0], self.exit[1])
-        queue = deque([start])
-        parents = {start: None}
-        visited = {start}
-
-        found = False
-        while queue:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return
-
-            current = queue.popleft()
-            # Реконструюємо шлях від входу до поточної клітинки за допомогою словника батьків
-            path = []
-            temp = current
-            while temp is not None:
-                path.append(temp)
-                temp = parents[temp]
-            path.reverse()
-
-            self.draw_maze(current_cell=current, path=path)
-            pygame.time.delay(self.delay)
-            self.clock.tick(60)
-
-            if current == goal:
-                found = True
+        rect = self.dirty_rect(x, y)
+        self.layer.set_clip(rect)
+        self.layer.fill(WHITE, rect)
+        for ny in range(max(y - 1, 0), min(y + 2, self.height)):
+            for nx in range(max(x - 1, 0), min(x + 2, self.width)):
+                self.draw_cell_walls(self.layer, nx, ny)
+        self.draw_decorations(self.layer)
+        self.layer.set_clip(None)
+
+    def draw_overlays(self, cells):
+        """
+        Малює накладки клітинок шарами: ребра дерева пошуку, активну клітинку,
+        відрізки шляху (кожен шар поверх попереднього).
+        """
+        for cell in cells:
+            parent = self.tree.get(cell)
+            if parent is not None:
+                self.screen.fill(LAVENDER, self.segment_rect(cell, parent, 2))
+        # Виділення активної клітинки
+        if self.current_cell in cells:
+            pygame.draw.rect(self.screen, RED, self.cell_rect(*self.current_cell).inflate(-4, -4))
+        # Відрізки шляху, що проходять через ці клітинки
+        for cell in cells:
+            index = self.path_index.get(cell)
+            if index is not None:
+                for neighbor in self.path[max(index - 1, 0):index + 2]:
+                    if neighbor != cell:
+                        self.screen.fill(PURPLE, self.segment_rect(cell, neighbor))
+
+    def draw_overlay_cell(self, cell):
+        """
+        Відновлює клітинку на екрані зі статичного шару і малює поверх неї накладки.
+        На малих клітинках накладки сусідів заходять у край прямокутника, тому, як і
+        для стін, малюються накладки всього блоку 3x3 з обрізанням.
+        """
+        x, y = cell
+        rect = self.dirty_rect(x, y)
+        self.screen.blit(self.layer, rect, rect)
+        self.screen.set_clip(rect)
+        self.draw_overlays([(nx, ny) for ny in range(max(y - 1, 0), min(y + 2, self.height))
+                            for nx in range(max(x - 1, 0), min(x + 2, self.width))])
+        self.screen.set_clip(None)
+        return rect
+
+    def set_path(self, path):
+        """Запам'ятовує новий шлях і повертає клітинки, де змінилося його зображення."""
+        old, new = self.path, list(path or [])
+        common = 0
+        for a, b in zip(old, new):
+            if a != b:
                 break
+            common += 1
+        # Остання спільна клітинка теж змінюється: до неї приєднується інший відрізок
+        dirty = set(old[max(common - 1, 0):]) | set(new[max(common - 1, 0):])
+        self.path = new
+        self.path_index = {cell: i for i, cell in enumerate(new)}
+        return dirty
+
+    def update(self, changed, current_cell=None, path=None, parent=None):
+        """
+        Інкрементально оновлює кадр:
+          - changed - клітинки, у яких змінилися стіни (оновлюються на статичному шарі)
+          - current_cell - активна клітинка (червоний прямокутник)
+          - path - шлях (послідовність клітинок), що малюється лінією (фіолетовим)
+          - parent - батько current_cell у дереві пошуку (ребро малюється тонкою лінією)
+        """
+        dirty = set(changed)
+        if parent is not None and self.tree.get(current_cell) != parent:
+            self.tree[current_cell] = parent
+            dirty.update((current_cell, parent))
+        for x, y in changed:
+            self.refresh_layer_cell(x, y)
+        if current_cell != self.current_cell:
+            dirty.update(cell for cell in (self.current_cell, current_cell) if cell is not None)
+            self.current_cell = current_cell
+        if path or self.path:
+            dirty |= self.set_path(path)
+        pygame.display.update([self.draw_overlay_cell(cell) for cell in dirty])
 
-            cx, cy = current
-            cell = self.maze[cy, cx]
-            for direction in [N, S, E, W]:
-                # Якщо відповідна стіна відсутня – існує прохід
-                if not (cell & direction):
-                    nx = cx + DX[direction]
-                    ny = cy + DY[direction]
-                    if 0 <= nx < self.width and 0 <= ny < self.height:
-                        next_cell = (nx, ny)
-                        if next_cell not in visited:
-                            visited.add(next_cell)
-                            parents[next_cell] = current
-                            queue.append(next_cell)
-
-        if found:
-            # Реконструюємо найкоротший шлях від входу до виходу
-            path = []
-            temp = goal
-            while temp is not None:
-                path.append(temp)
-                temp = parents[temp]
-            path.reverse()
-            self.draw_maze(path=path)
-        else:
-            print("Шлях не знайдено!")
+    def draw_maze(self, current_cell=None, path=None):
+        """
+        Повністю малює лабіринт:
+          - Внутрішні стіни (тонкими лініями)
+          - Товста обводка зовнішніх стін з прорізами для входу та виходу
+          - Вхід (зелений) та вихід (синій)
+          - Якщо current_cell задана, вона виділяється червоним прямокутником
+          - Якщо path задано (послідовність клітинок), малюється шлях лінією (фіолетовим)
+        """
+        self.render_layer()
+        self.screen.blit(self.layer, (0, 0))
+        self.current_cell = current_cell
+        self.path = []
+        self.path_index = {}
+        self.tree = {}
+        for cell in self.set_path(path) | ({current_cell} if current_cell else set()):
+            self.draw_overlay_cell(cell)
+        pygame.display.flip()
 
-    def run_all(self):
+    def run_all(self, solver="bfs", generator="dfs", generate=True):
         """
         Запускає повний цикл:
-          1. Генерує лабіринт
+          1. Генерує лабіринт алгоритмом generator (якщо generate; інакше показує вже
+             готовий, наприклад з файлу)
           2. Додає додаткові проходи
-          3. Чекає підтвердження у консолі для запуску алгоритму знаходження шляху (BFS)
-          4. Візуалізує процес пошуку найкоротшого шляху
+          3. Чекає підтвердження у консолі для запуску алгоритму знаходження шляху (solver)
+          4. Візуалізує процес пошуку (дерево пошуку) і знайдений шлях
         """
-        self.generate_maze()
-        self.add_extra_passages()
-        print("Лабіринт згенеровано. Натисніть Enter для запуску алгоритму знаходження найкоротшого шляху...")
+        if generate:
+            self.maze.generate_maze(generator)
+            self.maze.add_extra_passages()
+        if self.closed:
+            return
+        print("Лабіринт готовий. Натисніть Enter для запуску алгоритму знаходження найкоротшого шляху...")
         input()
-        self.solve_maze_bfs()
+        result = self.maze.solve(solver)
+        if self.closed:
+            return
+        length = len(result["path"]) if result["path"] else "-"
+        print(f"{solver}: довжина шляху {length}, розкрито клітинок {result['nodes_expanded']}, "
+              f"час {result['time'] * 1000:.1f} мс")
         # Утримання вікна відкритим після завершення
         running = True
         while running:
@@ -270,18 +299,33 @@ class Maze:
         pygame.quit()
 
 def main():
+    # python main.py [файл] - показати і розв'язати лабіринт, збережений модулем storage
+    path = sys.argv[1] if len(sys.argv) > 1 else None
     try:
-        width = int(input("Введіть ширину лабіринту (кількість клітинок): "))
-        height = int(input("Введіть висоту лабіринту (кількість клітинок): "))
+        if path is None:
+            width = int(input("Введіть ширину лабіринту (кількість клітинок): "))
+            height = int(input("Введіть висоту лабіринту (кількість клітинок): "))
         cell_size = int(input("Введіть розмір клітинки (у пікселях, наприклад 20): "))
         delay = int(input("Введіть затримку між кроками (у мілісекундах, наприклад 30): "))
-        extra_prob = float(input("Введіть ймовірність додаткового проходу (від 0 до 1, наприклад 0.1): "))
+        if path is None:
+            extra_prob = float(input("Введіть ймовірність додаткового проходу (від 0 до 1, наприклад 0.1): "))
     except ValueError:
         print("Будь ласка, введіть коректні числові значення!")
         return
+    generator = "dfs"
+    if path is None:
+        generator = input(f"Оберіть алгоритм генерації ({', '.join(GENERATORS)}; за замовчуванням dfs): ").strip() or "dfs"
+        if generator not in GENERATORS:
+            print(f"Невідомий алгоритм {generator!r}")
+            return
+    solver = input(f"Оберіть алгоритм пошуку ({', '.join(SOLVERS)}; за замовчуванням bfs): ").strip() or "bfs"
+    if solver not in SOLVERS:
+        print(f"Невідомий алгоритм {solver!r}")
+        return
 
-    maze = Maze(width, height, cell_size, delay, extra_prob)
-    maze.run_all()
+    maze = Maze(width, height, extra_prob) if path is None else load(path)
+    view = MazeView(maze, cell_size, delay)
+    view.run_all(solver, generator, generate=path is None)
 
 if __name__ == "__main__":
     main()
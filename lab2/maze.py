@@ -0,0 +1,182 @@
+"""
+Модель лабіринту без жодної залежності від pygame.
+
+Лабіринт зберігається як масив uint8 бітових масок стін (N, S, E, W) розміром
+height x width; його можна зберегти у файл і відкрити через memmap (модуль
+storage). Усі випадкові рішення беруться з random.Random(seed), тож лабіринт
+відтворюється за розміром, ймовірністю та seed. Генерація та пошук шляху
+працюють без дисплея; візуалізатор (або будь-який інший спостерігач)
+підписується на події кроків через subscribe().
+"""
+
+import random
+
+import numpy as np
+
+# Константи для стін: кожен біт відповідає окремій стіні
+N, S, E, W = 1, 2, 4, 8
+# Зміщення для кожного напрямку (x, y)
+DX = {E: 1, W: -1, N: 0, S: 0}
+DY = {E: 0, W: 0, N: -1, S: 1}
+# Протилежні стіни
+OPPOSITE = {N: S, S: N, E: W, W: E}
+
+
+class Maze:
+    def __init__(self, width, height, extra_passage_prob=0.1, seed=None):
+        """
+        width, height       - розмір лабіринту (кількість клітинок по горизонталі та вертикалі)
+        extra_passage_prob  - ймовірність додаткового проходу (для створення циклів)
+        seed                - зерно генератора (None - випадкове, зберігається в self.seed)
+        """
+        self.width = width
+        self.height = height
+        self.extra_passage_prob = extra_passage_prob
+        self.seed = random.getrandbits(63) if seed is None else seed
+        self.random = random.Random(self.seed)
+
+        # Кожна клітинка спочатку має всі 4 стіни (бітова маска 15)
+        self.maze = np.full((height, width), 15, dtype=np.uint8)
+        # Спостерігачі, які отримують події кроків (наприклад, візуалізатор)
+        self.observers = []
+
+        # Кандидати для входу/виходу – клітинки на межі лабіринту (O(width + height))
+        border_cells = [(x, y) for x in range(width) for y in sorted({0, height - 1})]
+        border_cells += [(x, y) for y in range(1, height - 1) for x in sorted({0, width - 1})]
+
+        # Випадковий вибір входу та виходу (якщо є інший кандидат)
+        entrance_cell = self.random.choice(border_cells)
+        border_cells.remove(entrance_cell)
+        exit_cell = self.random.choice(border_cells) if border_cells else entrance_cell
+
+        entrance_wall = self.random.choice(self.border_walls(*entrance_cell))
+        exit_wall = self.random.choice(self.border_walls(*exit_cell))
+
+        # 15 ^ wall замість ~wall: від'ємна маска не перетворюється на uint8
+        self.maze[entrance_cell[1], entrance_cell[0]] &= 15 ^ entrance_wall
+        self.maze[exit_cell[1], exit_cell[0]] &= 15 ^ exit_wall
+
+        self.entrance = (entrance_cell[0], entrance_cell[1], entrance_wall)
+        self.exit = (exit_cell[0], exit_cell[1], exit_wall)
+
+    @classmethod
+    def from_array(cls, walls, entrance, exit, extra_passage_prob=0.1, seed=None):
+        """
+        Створює лабіринт з готового масиву стін (наприклад, memmap з файлу) без копіювання.
+
+        walls     - масив height x width з бітовими масками стін
+        entrance  - (x, y, стіна) входу
+        exit      - (x, y, стіна) виходу
+        seed      - зерно, з яким лабіринт було згенеровано (None - невідоме)
+        """
+        maze = cls.__new__(cls)
+        maze.height, maze.width = walls.shape
+        maze.extra_passage_prob = extra_passage_prob
+        maze.seed = seed
+        maze.random = random.Random(seed)
+        maze.maze = walls
+        maze.observers = []
+        maze.entrance = tuple(int(value) for value in entrance)
+        maze.exit = tuple(int(value) for value in exit)
+        return maze
+
+    def border_walls(self, x, y):
+        """Повертає зовнішні стіни клітинки на межі лабіринту."""
+        walls = []
+        if y == 0:
+            walls.append(N)
+        if y == self.height - 1:
+            walls.append(S)
+        if x == 0:
+            walls.append(W)
+        if x == self.width - 1:
+            walls.append(E)
+        return walls
+
+    def subscribe(self, observer):
+        """
+        Додає спостерігача: observer(event, maze, **data).
+        Якщо спостерігач повертає True, поточна операція переривається.
+
+        Події та їхні дані:
+          generate_step  - current_cell, changed (клітинки, де змінилися стіни)
+          generated, passages_added
+          solve_step     - current_cell, parent (звідки клітинку досягнуто; None для кореня)
+          solved         - path (None, якщо шляху немає)
+        """
+        self.observers.append(observer)
+
+    def notify(self, event, **data):
+        """Надсилає подію всім спостерігачам; повертає True, якщо хтось попросив зупинку."""
+        stop = False
+        for observer in self.observers:
+            stop = bool(observer(event, self, **data)) or stop
+        return stop
+
+    def generate_maze(self, generator="dfs"):
+        """
+        Генерує досконалий лабіринт одним з алгоритмів модуля generators
+        (dfs - починаючи з точки входу, kruskal, wilson, eller). Події
+        "generate_step" надсилаються лише тоді, коли є спостерігачі.
+        """
+        # generators імпортує константи цього модуля, тому імпорт відкладений
+        from generators import GENERATORS, GenerationStopped
+        if generator not in GENERATORS:
+            raise ValueError(f"Невідомий генератор {generator!r}, доступні: {', '.join(GENERATORS)}")
+        try:
+            GENERATORS[generator](self)
+        except GenerationStopped:
+            return
+        self.notify("generated")
+
+    def add_extra_passages(self):
+        """
+        Додає додаткові проходи (цикли) всередині лабіринту для створення альтернативних шляхів.
+
+        Кожну стіну між двома внутрішніми клітинками можна прибрати з обох її боків
+        з ймовірністю extra_passage_prob, тобто разом з ймовірністю 1 - (1 - p)^2 - так
+        само, як при обході клітинок по черзі. Для цього на кожен напрямок береться
+        окрема випадкова маска, а біти обох сторін стіни знімаються зсунутими зрізами
+        масиву. Рядки обробляються смугами, щоб тимчасові масиви лишалися невеликими.
+        """
+        inner = self.maze[1:-1, 1:-1]
+        rows, cols = inner.shape
+        if rows > 0 and cols > 0:
+            rng = np.random.default_rng(self.random.getrandbits(64))
+            p = self.extra_passage_prob
+            band = max(1, (1 << 20) // cols)
+            for top in range(0, rows, band):
+                bottom = min(top + band, rows)
+                # Стіни E/W між сусідами в рядку
+                left, right = inner[top:bottom, :-1], inner[top:bottom, 1:]
+                shape = left.shape
+                chosen = (rng.random(shape, dtype=np.float32) < p) | (rng.random(shape, dtype=np.float32) < p)
+                clear = (chosen & (left & E).astype(bool)).astype(np.uint8)
+                left &= ~(clear * E)
+                right &= ~(clear * W)
+                # Стіни N/S між рядком і наступним
+                upper, lower = inner[top:min(bottom, rows - 1)], inner[top + 1:min(bottom, rows - 1) + 1]
+                shape = upper.shape
+                chosen = (rng.random(shape, dtype=np.float32) < p) | (rng.random(shape, dtype=np.float32) < p)
+                clear = (chosen & (upper & S).astype(bool)).astype(np.uint8)
+                upper &= ~(clear * S)
+                lower &= ~(clear * N)
+        self.notify("passages_added")
+
+    def solve(self, solver="bfs"):
+        """
+        Знаходить шлях від входу до виходу одним з алгоритмів модуля solvers
+        (bfs, astar, bidirectional, deadend). Спостерігачі отримують події
+        "solve_step" (current_cell, parent) та "solved" (path).
+        Повертає словник з шляхом, кількістю розкритих клітинок і часом пошуку.
+        """
+        # solvers імпортує константи цього модуля, тому імпорт відкладений
+        from solvers import solve
+        return solve(self, solver)
+
+    def solve_maze_bfs(self):
+        """
+        Знаходить найкоротший шлях у лабіринті (від точки входу до виходу) за допомогою алгоритму BFS.
+        Повертає шлях (список клітинок) або None, якщо шляху немає.
+        """
+        return self.solve("bfs")["path"]
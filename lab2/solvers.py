@@ -0,0 +1,269 @@
+"""
+Набір алгоритмів пошуку шляху в лабіринті Maze.
+
+Усі розв'язувачі працюють з плоскими індексами клітинок (y * width + x) та
+масивами array для батьків і відстаней замість множин і словників кортежів.
+Переходи між клітинками задаються маскою відкритих проходів кожної клітинки
+(зовнішні проходи входу та виходу закриті), тож перевірки меж не потрібні.
+
+Якщо в моделі є спостерігачі, на кожну розкриту клітинку надсилається подія
+"solve_step" з current_cell та parent (ребро дерева пошуку); шлях до поточної
+клітинки не реконструюється. Після завершення надсилається "solved" з path.
+"""
+
+import heapq
+import time
+from array import array
+from collections import deque
+
+import numpy as np
+
+from maze import N, S, E, W
+
+
+class SearchStopped(Exception):
+    """Спостерігач попросив перервати пошук."""
+
+
+def open_moves(maze):
+    """
+    Повертає bytes з маскою відкритих проходів (біти N, S, E, W) для кожної
+    клітинки у плоскому порядку. Проходи назовні лабіринту закриті.
+    """
+    moves = ~maze.maze.astype(np.uint8) & 15
+    moves[0, :] &= 15 ^ N
+    moves[-1, :] &= 15 ^ S
+    moves[:, -1] &= 15 ^ E
+    moves[:, 0] &= 15 ^ W
+    return moves.tobytes()
+
+
+def neighbor_table(width):
+    """Маска відкритих проходів -> кортеж зміщень плоского індексу."""
+    offsets = {N: -width, S: width, E: 1, W: -1}
+    return [tuple(offset for wall, offset in offsets.items() if mask & wall) for mask in range(16)]
+
+
+def _reporter(maze):
+    """Повертає функцію step(index, parent) для подій "solve_step" або None без спостерігачів."""
+    if not maze.observers:
+        return None
+    width = maze.width
+
+    def step(index, parent):
+        cell = (index % width, index // width)
+        previous = (parent % width, parent // width) if parent >= 0 and parent != index else None
+        if maze.notify("solve_step", current_cell=cell, parent=previous):
+            raise SearchStopped
+    return step
+
+
+def _trace(parents, start, goal):
+    """Відновлює шлях від start до goal за масивом батьків (список індексів)."""
+    path = [goal]
+    while path[-1] != start:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
+
+
+def _bfs(maze, start, goal, step, blocked=None):
+    """
+    BFS з плоскими масивами. blocked - необов'язковий bytearray клітинок, куди
+    заходити не можна (використовується заповненням тупиків).
+    Повертає (шлях з індексів або None, кількість розкритих клітинок).
+    """
+    moves = open_moves(maze)
+    table = neighbor_table(maze.width)
+    parents = array("i", [-1]) * (maze.width * maze.height)
+    parents[start] = start
+    queue = deque([start])
+    expanded = 0
+    while queue:
+        current = queue.popleft()
+        expanded += 1
+        if step:
+            step(current, parents[current])
+        if current == goal:
+            return _trace(parents, start, goal), expanded
+        for offset in table[moves[current]]:
+            following = current + offset
+            if parents[following] < 0 and not (blocked and blocked[following]):
+                parents[following] = current
+                queue.append(following)
+    return None, expanded
+
+
+def bfs(maze, start, goal, step=None):
+    """Пошук у ширину: найкоротший шлях за кількістю кроків."""
+    return _bfs(maze, start, goal, step)
+
+
+def astar(maze, start, goal, step=None):
+    """
+    A* з манхеттенською евристикою (допустима для руху по гратці без діагоналей).
+    Серед вершин з однаковою оцінкою першою розкривається ближча до цілі.
+    """
+    width = maze.width
+    moves = open_moves(maze)
+    table = neighbor_table(width)
+    size = width * maze.height
+    parents = array("i", [-1]) * size
+    distance = array("i", [-1]) * size
+    closed = bytearray(size)
+    gx, gy = goal % width, goal // width
+
+    def heuristic(index):
+        return abs(index % width - gx) + abs(index // width - gy)
+
+    parents[start] = start
+    distance[start] = 0
+    h = heuristic(start)
+    heap = [(h, h, start)]
+    expanded = 0
+    while heap:
+        _, _, current = heapq.heappop(heap)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        expanded += 1
+        if step:
+            step(current, parents[current])
+        if current == goal:
+            return _trace(parents, start, goal), expanded
+        g = distance[current] + 1
+        for offset in table[moves[current]]:
+            following = current + offset
+            if not closed[following] and (distance[following] < 0 or g < distance[following]):
+                distance[following] = g
+                parents[following] = current
+                h = heuristic(following)
+                heapq.heappush(heap, (g + h, h, following))
+    return None, expanded
+
+
+def bidirectional(maze, start, goal, step=None):
+    """
+    Двонапрямлений BFS: пошук одночасно від входу та від виходу, щоразу
+    розкривається цілий рівень меншого фронту. Після рівня, на якому фронти
+    зустрілися, вибирається найкоротше з'єднання, тож шлях лишається найкоротшим.
+    """
+    moves = open_moves(maze)
+    table = neighbor_table(maze.width)
+    size = maze.width * maze.height
+    if start == goal:
+        if step:
+            step(start, start)
+        return [start], 1
+
+    sides = []
+    for root in (start, goal):
+        parents = array("i", [-1]) * size
+        distance = array("i", [-1]) * size
+        parents[root] = root
+        distance[root] = 0
+        sides.append((parents, distance, [root]))
+
+    expanded = 0
+    while sides[0][2] and sides[1][2]:
+        side = 0 if len(sides[0][2]) <= len(sides[1][2]) else 1
+        parents, distance, frontier = sides[side]
+        other_distance = sides[1 - side][1]
+        best, meeting = None, None
+        following_frontier = []
+        for current in frontier:
+            expanded += 1
+            if step:
+                step(current, parents[current])
+            for offset in table[moves[current]]:
+                following = current + offset
+                if distance[following] < 0:
+                    distance[following] = distance[current] + 1
+                    parents[following] = current
+                    following_frontier.append(following)
+                if other_distance[following] >= 0:
+                    total = distance[current] + 1 + other_distance[following]
+                    if best is None or total < best:
+                        best, meeting = total, (current, following)
+        sides[side] = (parents, distance, following_frontier)
+        if meeting is not None:
+            current, following = meeting
+            roots = (start, goal)
+            # Частина від кореня цього боку до current, далі від following до іншого кореня
+            near = _trace(parents, roots[side], current)
+            far = _trace(sides[1 - side][0], roots[1 - side], following)
+            path = near + far[::-1]
+            return (path if side == 0 else path[::-1]), expanded
+    return None, expanded
+
+
+def dead_end_filling(maze, start, goal, step=None):
+    """
+    Заповнення тупиків: клітинки з одним проходом (крім входу та виходу)
+    по черзі "замуровуються", доки тупиків не залишиться. У досконалому
+    лабіринті незаповненим лишається саме шлях; якщо додаткові проходи
+    утворили цикли, найкоротший шлях шукається BFS серед незаповнених клітинок.
+    """
+    moves = open_moves(maze)
+    table = neighbor_table(maze.width)
+    degree = bytearray(len(table[mask]) for mask in moves)
+    filled = bytearray(len(moves))
+    dead_ends = deque(index for index, count in enumerate(degree)
+                      if count <= 1 and index != start and index != goal)
+    expanded = 0
+    while dead_ends:
+        current = dead_ends.popleft()
+        filled[current] = 1
+        expanded += 1
+        if step:
+            step(current, -1)
+        for offset in table[moves[current]]:
+            following = current + offset
+            if not filled[following]:
+                degree[following] -= 1
+                if degree[following] == 1 and following != start and following != goal:
+                    dead_ends.append(following)
+    path, searched = _bfs(maze, start, goal, step, filled)
+    return path, expanded + searched
+
+
+# Назва алгоритму -> функція(maze, start, goal, step) -> (шлях з індексів або None, розкрито клітинок)
+SOLVERS = {
+    "bfs": bfs,
+    "astar": astar,
+    "bidirectional": bidirectional,
+    "deadend": dead_end_filling,
+}
+
+
+def solve(maze, solver="bfs"):
+    """
+    Шукає шлях від входу до виходу обраним алгоритмом.
+
+    Повертає словник з ключами:
+      solver          - назва алгоритму
+      path            - список клітинок (x, y) або None, якщо шляху немає (чи пошук перервано)
+      nodes_expanded  - кількість розкритих клітинок
+      time            - тривалість пошуку в секундах
+      stopped         - True, якщо спостерігач перервав пошук
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Невідомий алгоритм {solver!r}, доступні: {', '.join(SOLVERS)}")
+    width = maze.width
+    start = maze.entrance[1] * width + maze.entrance[0]
+    goal = maze.exit[1] * width + maze.exit[0]
+    step = _reporter(maze)
+
+    started = time.perf_counter()
+    stopped = False
+    try:
+        path, expanded = SOLVERS[solver](maze, start, goal, step)
+    except SearchStopped:
+        path, expanded, stopped = None, None, True
+    elapsed = time.perf_counter() - started
+
+    if path is not None:
+        path = [(index % width, index // width) for index in path]
+    if not stopped:
+        maze.notify("solved", path=path)
+    return {"solver": solver, "path": path, "nodes_expanded": expanded, "time": elapsed, "stopped": stopped}
@@ -0,0 +1,219 @@
+"""
+Компактний формат файлу лабіринту з можливістю memory-mapping.
+
+Структура файлу (little-endian):
+
+    заголовок  magic, версія, кодування, width, height, вхід (x, y, стіна),
+               вихід (x, y, стіна), seed, ймовірність додаткових проходів;
+               доповнений нулями до DATA_OFFSET байтів
+    стіни      height * width масок стін по рядках:
+               ENCODING_UINT8  - байт на клітинку (відкривається через np.memmap)
+               ENCODING_NIBBLE - дві клітинки на байт (молодші 4 біти - парна клітинка)
+
+Лабіринт у кодуванні uint8 можна згенерувати один раз, а потім розв'язувати або
+малювати в інших процесах: load() повертає Maze, масив стін якого є memmap,
+тож у пам'ять потрапляють лише прочитані сторінки. Кодування nibble удвічі
+менше на диску, але при завантаженні розпаковується в пам'ять.
+
+Поруч з файлом можна зберегти індекс відстаней до виходу (модуль distance):
+команда index будує його, команда query відповідає на запити без пошуку.
+
+stream_eller() пише лабіринт алгоритмом Еллера рядок за рядком, не тримаючи
+його в пам'яті, тож висота обмежена лише місцем на диску.
+"""
+
+import argparse
+import random
+import struct
+
+import numpy as np
+
+from distance import DistanceIndex
+from generators import GENERATORS, eller_rows
+from maze import Maze, N, S
+
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sHBxIIIIBxxxIIBxxxQd")
+DATA_OFFSET = 64
+ENCODING_UINT8 = 0
+ENCODING_NIBBLE = 1
+ENCODINGS = {"uint8": ENCODING_UINT8, "nibble": ENCODING_NIBBLE}
+# Значення поля seed, якщо зерно невідоме
+NO_SEED = (1 << 64) - 1
+
+
+def pack_nibbles(walls):
+    """Пакує маски стін (0..15) по дві на байт."""
+    flat = np.asarray(walls, dtype=np.uint8).ravel()
+    if flat.size % 2:
+        flat = np.append(flat, np.uint8(0))
+    return flat[0::2] | (flat[1::2] << 4)
+
+
+def unpack_nibbles(packed, height, width):
+    """Розпаковує результат pack_nibbles у масив height x width."""
+    flat = np.empty(packed.size * 2, dtype=np.uint8)
+    flat[0::2] = packed & 15
+    flat[1::2] = packed >> 4
+    return flat[:height * width].reshape(height, width)
+
+
+def write_header(file, width, height, entrance, exit, seed=None, extra_passage_prob=0.0,
+                 encoding=ENCODING_UINT8):
+    """Записує заголовок (доповнений до DATA_OFFSET) у початок відкритого файлу."""
+    header = HEADER.pack(MAGIC, VERSION, encoding, width, height, *entrance, *exit,
+                         NO_SEED if seed is None else seed, extra_passage_prob)
+    file.seek(0)
+    file.write(header.ljust(DATA_OFFSET, b"\0"))
+
+
+def read_header(path):
+    """
+    Читає заголовок файлу лабіринту.
+    Повертає словник: encoding, width, height, entrance, exit, seed, extra_passage_prob.
+    """
+    with open(path, "rb") as file:
+        data = file.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} не є файлом лабіринту")
+    (magic, version, encoding, width, height, ex, ey, entrance_wall, xx, xy, exit_wall,
+     seed, extra_passage_prob) = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} не є файлом лабіринту")
+    if version != VERSION:
+        raise ValueError(f"{path}: непідтримувана версія формату {version}")
+    if encoding not in ENCODINGS.values():
+        raise ValueError(f"{path}: невідоме кодування стін {encoding}")
+    return {
+        "encoding": encoding,
+        "width": width,
+        "height": height,
+        "entrance": (ex, ey, entrance_wall),
+        "exit": (xx, xy, exit_wall),
+        "seed": None if seed == NO_SEED else seed,
+        "extra_passage_prob": extra_passage_prob,
+    }
+
+
+def save(maze, path, encoding="uint8"):
+    """
+    Зберігає лабіринт у файл.
+
+    encoding - "uint8" (можна відкрити через memmap) або "nibble" (удвічі менший файл)
+    """
+    code = ENCODINGS[encoding]
+    with open(path, "wb") as file:
+        write_header(file, maze.width, maze.height, maze.entrance, maze.exit,
+                     maze.seed, maze.extra_passage_prob, code)
+        walls = np.asarray(maze.maze, dtype=np.uint8)
+        if code == ENCODING_NIBBLE:
+            walls = pack_nibbles(walls)
+        # Запис смугами рядків, щоб не створювати копію великого лабіринту
+        rows = walls.reshape(-1, walls.shape[-1]) if walls.ndim > 1 else walls.reshape(1, -1)
+        band = max(1, (1 << 24) // max(rows.shape[1], 1))
+        for top in range(0, rows.shape[0], band):
+            file.write(np.ascontiguousarray(rows[top:top + band]).tobytes())
+
+
+def stream_eller(path, width, height, seed=None):
+    """
+    Генерує лабіринт алгоритмом Еллера прямо у файл (кодування uint8).
+    Вхід - проріз у північній стіні першого рядка, вихід - у південній стіні
+    останнього. Повертає заголовок записаного лабіринту (як read_header).
+    """
+    seed = random.getrandbits(63) if seed is None else seed
+    rng = random.Random(seed)
+    entrance = (rng.randrange(width), 0, N)
+    exit = (rng.randrange(width), height - 1, S)
+    with open(path, "wb") as file:
+        write_header(file, width, height, entrance, exit, seed)
+        for y, row in enumerate(eller_rows(width, height, rng)):
+            if y == 0:
+                row[entrance[0]] &= 15 ^ N
+            if y == height - 1:
+                row[exit[0]] &= 15 ^ S
+            file.write(row.tobytes())
+    return read_header(path)
+
+
+def load(path, mode="r"):
+    """
+    Відкриває файл лабіринту.
+
+    mode - режим np.memmap для кодування uint8: "r" (лише читання), "r+" (зміни
+           записуються у файл) або "c" (копіювання при записі)
+    Повертає Maze; для uint8 його масив стін є memmap і не читається повністю.
+    """
+    header = read_header(path)
+    height, width = header["height"], header["width"]
+    if header["encoding"] == ENCODING_UINT8:
+        walls = np.memmap(path, dtype=np.uint8, mode=mode, offset=DATA_OFFSET, shape=(height, width))
+    else:
+        packed = np.fromfile(path, dtype=np.uint8, count=(height * width + 1) // 2, offset=DATA_OFFSET)
+        walls = unpack_nibbles(packed, height, width)
+    return Maze.from_array(walls, header["entrance"], header["exit"],
+                           header["extra_passage_prob"], header["seed"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Збереження та розв'язання лабіринтів з файлів")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="згенерувати лабіринт і зберегти у файл")
+    generate.add_argument("width", type=int)
+    generate.add_argument("height", type=int)
+    generate.add_argument("path")
+    generate.add_argument("--prob", type=float, default=0.1, help="ймовірність додаткового проходу")
+    generate.add_argument("--seed", type=int, default=None)
+    generate.add_argument("--encoding", choices=ENCODINGS, default="uint8")
+    generate.add_argument("--generator", choices=GENERATORS, default="dfs")
+
+    stream = commands.add_parser("stream", help="записати лабіринт Еллера у файл рядок за рядком")
+    stream.add_argument("width", type=int)
+    stream.add_argument("height", type=int)
+    stream.add_argument("path")
+    stream.add_argument("--seed", type=int, default=None)
+
+    solve = commands.add_parser("solve", help="знайти шлях у збереженому лабіринті")
+    solve.add_argument("path")
+    solve.add_argument("--solver", default="bfs")
+
+    index = commands.add_parser("index", help="побудувати індекс відстаней до виходу поруч з файлом")
+    index.add_argument("path")
+
+    query = commands.add_parser("query", help="відстань і наступний хід від клітинки до виходу")
+    query.add_argument("path")
+    query.add_argument("x", type=int)
+    query.add_argument("y", type=int)
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        maze = Maze(args.width, args.height, args.prob, args.seed)
+        maze.generate_maze(args.generator)
+        maze.add_extra_passages()
+        save(maze, args.path, args.encoding)
+        print(f"{args.path}: {maze.width}x{maze.height}, seed {maze.seed}")
+    elif args.command == "index":
+        DistanceIndex.build(load(args.path)).save(args.path)
+        print(f"{args.path}: індекс відстаней збережено")
+    elif args.command == "query":
+        index = DistanceIndex.load(args.path)
+        distance = index.distance(args.x, args.y)
+        if distance is None:
+            print("вихід недосяжний")
+        else:
+            print(f"відстань до виходу {distance}, наступний хід {index.next_move(args.x, args.y)}")
+    elif args.command == "stream":
+        header = stream_eller(args.path, args.width, args.height, args.seed)
+        print(f"{args.path}: {header['width']}x{header['height']}, seed {header['seed']}")
+    else:
+        maze = load(args.path)
+        result = maze.solve(args.solver)
+        length = len(result["path"]) if result["path"] else "-"
+        print(f"{args.solver}: довжина шляху {length}, розкрито клітинок {result['nodes_expanded']}, "
+              f"час {result['time'] * 1000:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
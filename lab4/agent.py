@@ -0,0 +1,219 @@
+"""
+Автоматичний гравець «Світу Вампусу» з імовірнісною моделлю печер.
+
+Агент зберігає для кожного виду небезпек (Вампус, ями, кажани) ваги печер у
+масиві numpy та їхню суму: імовірність небезпеки в печері - count * вага / сума
+(для ям і кажанів кожен з двох об'єктів вважається незалежним, для Вампуса
+модель точна). Кожне спостереження змінює лише ваги суміжних печер і суму,
+тобто коштує O(степінь печери):
+
+  немає відчуття       - ваги суміжних печер обнуляються
+  є відчуття           - ваги суміжних печер множаться на 1 / q, де q - імовірність
+                         відчуття від решти об'єктів (для Вампуса q = 0 - вага
+                         лишається тільки в суміжних печерах; це розрахунок по
+                         всьому масиву, але він потрібен лише при першій локалізації)
+  гравець живий        - вага поточної печери обнуляється
+  кажани перенесли     - печера, куди гравець ішов, - печера кажанів
+
+Після промаху стрілою печери шляху стріли виключаються, а Вампус переходить
+у суміжну печеру з ймовірністю 0.75: ваги розподіляються по рядках CSR
+(O(кількість тунелів), не частіше одного разу на стрілу).
+
+    python agent.py --games 10000
+"""
+
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+
+from main import HuntTheWumpus, OUTCOMES
+
+# Кількість об'єктів кожного виду на карті (див. HuntTheWumpus.__init__)
+WUMPUSES, PITS, BATS = 1, 2, 2
+# Імовірність, що Вампус переходить після промаху (див. HuntTheWumpus.shoot_arrow)
+WUMPUS_MOVE_PROB = 0.75
+
+
+class Belief:
+    """Ваги печер для count однакових об'єктів; імовірність - count * вага / сума."""
+
+    def __init__(self, size, count, start):
+        self.count = count
+        self.weights = np.ones(size + 1)
+        self.weights[0] = 0.0
+        self.weights[start] = 0.0
+        self.total = float(size - 1)
+
+    def probability(self, caves):
+        """Імовірності об'єкта в печерах caves (масив)."""
+        return np.minimum(self.count * self.weights[caves] / self.total, 1.0)
+
+    def clear(self, caves):
+        """Об'єкта немає в печерах caves."""
+        self.total -= self.weights[caves].sum()
+        self.weights[caves] = 0.0
+
+    def observe(self, caves, present):
+        """Відчуття від печер caves: чи є об'єкт хоча б в одній з них."""
+        if not present:
+            self.clear(caves)
+            return
+        mass = self.weights[caves].sum() / self.total
+        if mass <= 0.0:
+            # Суперечить моделі (наближення для кількох об'єктів) - відчуття ігнорується
+            return
+        if self.count == 1:
+            if mass < 1.0 - 1e-12:
+                kept = self.weights[caves].copy()
+                self.weights[:] = 0.0
+                self.weights[caves] = kept
+                self.total = float(kept.sum())
+            return
+        others = 1.0 - (1.0 - mass) ** (self.count - 1)
+        factor = 1.0 / max(others, 1e-12)
+        self.total += self.weights[caves].sum() * (factor - 1.0)
+        self.weights[caves] *= factor
+
+    def relocate(self, caves, inverse_degree, probability):
+        """Об'єкт з ймовірністю probability переходить у випадкову суміжну печеру."""
+        share = np.repeat(self.weights * inverse_degree, np.diff(caves.indptr))
+        moved = np.bincount(caves.indices, weights=share, minlength=len(self.weights))
+        self.weights = (1.0 - probability) * self.weights + probability * moved
+        self.total = float(self.weights.sum())
+
+
+class BeliefAgent:
+    """
+    Гравець, що обирає дію за імовірностями небезпек у суміжних печерах.
+
+    caves            - граф печер гри (HuntTheWumpus.caves)
+    observation      - початкове спостереження (HuntTheWumpus.observe())
+    shoot_threshold  - стріляти, якщо Вампус у суміжній печері з такою імовірністю
+    bat_penalty      - ціна печери з кажанами відносно імовірності загибелі
+    explore_penalty  - ціна кожного попереднього відвідування печери
+    """
+
+    def __init__(self, caves, observation, shoot_threshold=0.5, bat_penalty=0.05, explore_penalty=0.01):
+        self.caves = caves
+        self.shoot_threshold = shoot_threshold
+        self.bat_penalty = bat_penalty
+        self.explore_penalty = explore_penalty
+
+        start, size = observation["cave"], caves.size
+        self.wumpus = Belief(size, WUMPUSES, start)
+        self.pits = Belief(size, PITS, start)
+        self.bats = Belief(size, BATS, start)
+        self.known_bats = np.zeros(size + 1, dtype=bool)
+        self.visits = np.zeros(size + 1, dtype=np.int32)
+
+        degree = np.diff(caves.indptr[1:]).astype(float)
+        self._inverse_degree = np.zeros(size + 1)
+        np.divide(1.0, degree, out=self._inverse_degree[1:], where=degree > 0)
+        # Відчуття ям і кажанів не змінюються - враховуються один раз на печеру;
+        # відчуття Вампуса - один раз на кожне його положення (epoch)
+        self._sensed = np.zeros(size + 1, dtype=bool)
+        self._wumpus_sensed = np.full(size + 1, -1, dtype=np.int32)
+        self._epoch = 0
+        self.decision_time = 0.0
+        self.decisions = 0
+        self.sense(observation)
+
+    def sense(self, observation):
+        """Враховує спостереження в поточній печері."""
+        cave = observation["cave"]
+        neighbors = self.caves.neighbors(cave)
+        self.visits[cave] += 1
+        for belief in (self.wumpus, self.pits, self.bats):
+            belief.clear(cave)
+        if not self._sensed[cave]:
+            self._sensed[cave] = True
+            self.pits.observe(neighbors, observation["breeze"])
+            self.bats.observe(neighbors, observation["rustle"])
+        if self._wumpus_sensed[cave] != self._epoch:
+            self._wumpus_sensed[cave] = self._epoch
+            self.wumpus.observe(neighbors, observation["stench"])
+
+    def update(self, action, target, observation):
+        """Оновлює модель після ходу action з ціллю target та нового спостереження."""
+        if action == "move" and observation["cave"] != target:
+            # Гравець не дійшов до target - кажани перенесли його звідти
+            self.known_bats[target] = True
+            self.wumpus.clear(target)
+            self.pits.clear(target)
+        elif action == "shoot":
+            self.wumpus.clear(np.asarray(target))
+            self.wumpus.relocate(self.caves, self._inverse_degree, WUMPUS_MOVE_PROB)
+            self._epoch += 1
+        self.sense(observation)
+
+    def act(self, observation):
+        """Повертає (дія, ціль) для HuntTheWumpus.step."""
+        started = time.perf_counter()
+        neighbors = self.caves.neighbors(observation["cave"])
+        wumpus = self.wumpus.probability(neighbors)
+        best = int(wumpus.argmax())
+        if observation["arrows"] > 0 and wumpus[best] >= self.shoot_threshold:
+            decision = ("shoot", [int(neighbors[best])])
+        else:
+            death = 1.0 - (1.0 - wumpus) * (1.0 - self.pits.probability(neighbors))
+            bats = np.where(self.known_bats[neighbors], 1.0, self.bats.probability(neighbors))
+            cost = death + self.bat_penalty * bats + self.explore_penalty * self.visits[neighbors]
+            decision = ("move", int(neighbors[cost.argmin()]))
+        self.decision_time += time.perf_counter() - started
+        self.decisions += 1
+        return decision
+
+
+def play(game, max_steps=1000, **options):
+    """Грає гру game агентом BeliefAgent; повертає (причина завершення, агент)."""
+    observation = game.observe()
+    agent = BeliefAgent(game.caves, observation, **options)
+    for _ in range(max_steps):
+        action, target = agent.act(observation)
+        observation, _, done = game.step(action, target)
+        if done:
+            break
+        agent.update(action, target, observation)
+    return game.outcome, agent
+
+
+def evaluate(games, seed=0, caves=None, **options):
+    """
+    Грає games ігор з зернами seed, seed + 1, ...; повертає словник з кількістю
+    завершень за причинами, часткою перемог і середнім часом рішення агента.
+    """
+    outcomes = Counter()
+    decision_time, decisions = 0.0, 0
+    started = time.perf_counter()
+    for index in range(games):
+        outcome, agent = play(HuntTheWumpus(seed + index, output=None, caves=caves), **options)
+        outcomes[outcome] += 1
+        decision_time += agent.decision_time
+        decisions += agent.decisions
+    return {
+        "games": games,
+        "win_rate": outcomes["won"] / games,
+        "outcomes": {("running" if name is None else name): outcomes[name] for name in OUTCOMES},
+        "decision_us": decision_time / decisions * 1e6 if decisions else None,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Оцінка агента з імовірнісною моделлю печер")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shoot-threshold", type=float, default=0.5)
+    args = parser.parse_args()
+
+    result = evaluate(args.games, args.seed, shoot_threshold=args.shoot_threshold)
+    print(f"Ігор: {result['games']}, перемог: {result['win_rate']:.2%}, "
+          f"час рішення: {result['decision_us']:.1f} мкс, усього {result['seconds']:.1f} с")
+    for name, count in result["outcomes"].items():
+        print(f"  {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Граф печер довільного розміру для «Світу Вампусу».
+
+Печери нумеруються з 1 (як у CAVE_MAP), тунелі зберігаються у форматі CSR:
+суміжні печери печери c - indices[indptr[c]:indptr[c + 1]] (рядок 0 порожній).
+Порядок сусідів і напрямленість тунелів зберігаються такими, як задано.
+
+  adjacent(a, b)   - O(1): для графів до BITSET_LIMIT печер - бітова матриця
+                     суміжності, для більших - перегляд рядка CSR (степінь печер
+                     обмежений, тож це теж стала кількість операцій)
+  distance(a, b)   - кількість переходів: для графів до ALL_PAIRS_LIMIT печер
+                     таблиця відстаней усіх пар будується один раз при першому
+                     запиті, для більших - рядки BFS від печери a кешуються (LRU)
+
+Графи можна згенерувати (dodecahedron, random_cubic, lattice) або завантажити з
+текстового файлу (load): рядки "печера: сусід сусід ..." або пари "a b" (тунель
+в обидва боки); порожні рядки та рядки з # пропускаються.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+# Карта печер (20 вершин додекаедра).
+# Кожна печера (ключ словника) має список суміжних печер.
+CAVE_MAP = {
+    1: [2, 5, 8],
+    2: [1, 3, 10],
+    3: [2, 4, 12],
+    4: [3, 5, 14],
+    5: [1, 4, 6],
+    6: [5, 7, 15],
+    7: [16, 8, 17],
+    8: [1, 7, 9],
+    9: [8, 10, 18],
+    10: [2, 9, 11],
+    11: [10, 12, 19],
+    12: [3, 11, 13],
+    13: [12, 14, 20],
+    14: [4, 13, 15],
+    15: [6, 14, 16],
+    16: [15, 17, 20],
+    17: [7, 16, 18],
+    18: [9, 17, 19],
+    19: [11, 18, 20],
+    20: [13, 16, 19]
+}
+
+BITSET_LIMIT = 8192
+ALL_PAIRS_LIMIT = 2048
+BFS_CACHE_SIZE = 256
+
+
+class CaveGraph:
+    """Граф печер у форматі CSR з номерами печер від 1 до size."""
+
+    def __init__(self, indptr, indices):
+        """
+        indptr   - масив size + 2 зміщень рядків (рядок 0 порожній)
+        indices  - масив номерів суміжних печер
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.size = len(self.indptr) - 2
+        self._bitset = None
+        self._all_pairs = None
+        self._rows = OrderedDict()
+
+    @classmethod
+    def from_dict(cls, cave_map):
+        """Граф зі словника печера -> список суміжних печер (як CAVE_MAP)."""
+        size = max(cave_map)
+        for cave, neighbors in cave_map.items():
+            if cave < 1 or any(not 1 <= neighbor <= size for neighbor in neighbors):
+                raise ValueError(f"Печера {cave}: номери печер мають бути від 1 до {size}, отримано {neighbors}")
+        degrees = np.zeros(size + 2, dtype=np.int64)
+        for cave, neighbors in cave_map.items():
+            degrees[cave + 1] = len(neighbors)
+        indptr = np.cumsum(degrees)
+        indices = np.zeros(indptr[-1], dtype=np.int32)
+        for cave, neighbors in cave_map.items():
+            indices[indptr[cave]:indptr[cave + 1]] = neighbors
+        return cls(indptr, indices)
+
+    @classmethod
+    def from_edges(cls, size, sources, targets, both_ways=True):
+        """
+        Граф з масивів тунелів sources[i] -> targets[i] (печери від 1 до size).
+        both_ways - додати також зворотні тунелі. Петлі та повторні тунелі
+        відкидаються (інакше випадковий вибір суміжної печери був би нерівномірним).
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if len(sources) and (min(sources.min(), targets.min()) < 1 or max(sources.max(), targets.max()) > size):
+            raise ValueError(f"Номери печер мають бути від 1 до {size}")
+        if both_ways:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+        # Перше входження кожного тунелю, у заданому порядку
+        _, first = np.unique(sources * (size + 1) + targets, return_index=True)
+        first.sort()
+        first = first[sources[first] != targets[first]]
+        sources, targets = sources[first], targets[first]
+        order = np.argsort(sources, kind="stable")
+        sources, targets = sources[order], targets[order]
+        indptr = np.zeros(size + 2, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(sources, minlength=size + 1))
+        return cls(indptr, targets)
+
+    @classmethod
+    def dodecahedron(cls):
+        """Класична карта гри: 20 вершин додекаедра (CAVE_MAP)."""
+        return cls.from_dict(CAVE_MAP)
+
+    @classmethod
+    def random_cubic(cls, size, seed=None):
+        """
+        Зв'язний граф, де кожна печера має 3 тунелі: кільце печер плюс випадкове
+        розбиття всіх печер на пари (хорди). size має бути парним і не меншим за 4.
+        """
+        if size < 4 or size % 2:
+            raise ValueError("Кількість печер має бути парною і не меншою за 4")
+        rng = np.random.default_rng(seed)
+        caves = np.arange(1, size + 1)
+        ring = np.roll(caves, -1)
+        # Хорда між сусідами по кільцю дала б подвійний тунель; у середньому така хорда
+        # одна на розбиття, тож розбиття без них знаходиться за кілька спроб
+        while True:
+            pairs = rng.permutation(caves).reshape(-1, 2)
+            gap = np.abs(pairs[:, 0] - pairs[:, 1])
+            if not ((gap == 1) | (gap == size - 1)).any():
+                break
+        sources = np.concatenate((caves, pairs[:, 0]))
+        targets = np.concatenate((ring, pairs[:, 1]))
+        return cls.from_edges(size, sources, targets)
+
+    @classmethod
+    def lattice(cls, width, height):
+        """
+        Тор width x height: кожна печера з'єднана з 4 сусідами (з переходом
+        через край). Якщо ширина чи висота менша за 3, сусіди по цій осі
+        збігаються, тож суміжних печер менше.
+        """
+        caves = np.arange(width * height).reshape(height, width)
+        east = np.roll(caves, -1, axis=1)
+        south = np.roll(caves, -1, axis=0)
+        sources = np.concatenate((caves.ravel(), caves.ravel())) + 1
+        targets = np.concatenate((east.ravel(), south.ravel())) + 1
+        return cls.from_edges(width * height, sources, targets)
+
+    @classmethod
+    def load(cls, path):
+        """Завантажує граф з текстового файлу (формат - див. опис модуля)."""
+        cave_map = {}
+        sources, targets = [], []
+        with open(path) as file:
+            for line in file:
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                if ":" in line:
+                    cave, neighbors = line.split(":", 1)
+                    cave_map[int(cave)] = [int(value) for value in neighbors.replace(",", " ").split()]
+                else:
+                    source, target = line.split()[:2]
+                    sources.append(int(source))
+                    targets.append(int(target))
+        if cave_map and sources:
+            raise ValueError(f"{path}: змішано формати 'печера: сусіди' та пари 'a b'")
+        if cave_map:
+            return cls.from_dict(cave_map)
+        size = max(max(sources), max(targets))
+        return cls.from_edges(size, sources, targets)
+
+    def save(self, path):
+        """Зберігає граф у форматі рядків "печера: сусіди"."""
+        with open(path, "w") as file:
+            for cave in range(1, self.size + 1):
+                file.write(f"{cave}: {' '.join(map(str, self.neighbors(cave)))}\n")
+
+    def caves(self):
+        """Номери всіх печер."""
+        return range(1, self.size + 1)
+
+    def neighbors(self, cave):
+        """Суміжні печери (масив numpy у порядку задання)."""
+        return self.indices[self.indptr[cave]:self.indptr[cave + 1]]
+
+    def degree(self, cave):
+        return int(self.indptr[cave + 1] - self.indptr[cave])
+
+    def regular_degree(self):
+        """Спільна кількість тунелів усіх печер або None, якщо вона різна."""
+        degrees = np.diff(self.indptr[1:])
+        return int(degrees[0]) if degrees.size and (degrees == degrees[0]).all() else None
+
+    def adjacency_array(self):
+        """Масив (size + 1) x степінь для графа з однаковим степенем (рядок 0 - нулі)."""
+        degree = self.regular_degree()
+        if degree is None:
+            raise ValueError("Печери мають різну кількість тунелів")
+        return np.vstack((np.zeros((1, degree), dtype=self.indices.dtype), self.indices.reshape(-1, degree)))
+
+    def adjacent(self, a, b):
+        """Чи веде тунель з печери a до печери b."""
+        if not (1 <= a <= self.size and 1 <= b <= self.size):
+            return False
+        if self.size <= BITSET_LIMIT:
+            if self._bitset is None:
+                self._bitset = self._build_bitset()
+            return bool(self._bitset[a, b >> 3] >> (b & 7) & 1)
+        start, stop = self.indptr[a], self.indptr[a + 1]
+        return bool((self.indices[start:stop] == b).any())
+
+    def _build_bitset(self):
+        rows = np.repeat(np.arange(self.size + 1), np.diff(self.indptr))
+        dense = np.zeros((self.size + 1, self.size + 1), dtype=bool)
+        dense[rows, self.indices] = True
+        return np.packbits(dense, axis=1, bitorder="little")
+
+    def bfs_row(self, source):
+        """
+        Відстані (кількість переходів) від source до всіх печер: масив size + 1,
+        -1 для недосяжних. BFS іде рівнями, фронт розкривається через CSR векторно.
+        """
+        distance = np.full(self.size + 1, -1, dtype=np.int32)
+        distance[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        level = 0
+        while frontier.size:
+            level += 1
+            starts, stops = self.indptr[frontier], self.indptr[frontier + 1]
+            lengths = stops - starts
+            # Індекси всіх тунелів фронту: starts[i] .. stops[i] - 1 для кожного i
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            following = self.indices[np.repeat(starts, lengths) + offsets]
+            following = np.unique(following[distance[following] < 0])
+            distance[following] = level
+            frontier = following
+        return distance
+
+    def distance(self, a, b):
+        """Кількість переходів від печери a до печери b (-1, якщо b недосяжна)."""
+        if self.size <= ALL_PAIRS_LIMIT:
+            if self._all_pairs is None:
+                dtype = np.int8 if self.size < 127 else np.int16
+                self._all_pairs = np.vstack([np.full(self.size + 1, -1, dtype=dtype)] +
+                                            [self.bfs_row(cave).astype(dtype) for cave in self.caves()])
+            return int(self._all_pairs[a, b])
+        row = self._rows.get(a)
+        if row is None:
+            row = self._rows[a] = self.bfs_row(a)
+            if len(self._rows) > BFS_CACHE_SIZE:
+                self._rows.popitem(last=False)
+        else:
+            self._rows.move_to_end(a)
+        return int(row[b])
+
+    def within(self, cave, targets, hops=1):
+        """Чи є серед targets печера на відстані від 1 до hops переходів від cave."""
+        if hops == 1:
+            return any(self.adjacent(cave, target) for target in targets)
+        return any(0 < self.distance(cave, target) <= hops for target in targets)
@@ -0,0 +1,121 @@
+"""
+Генератор навантаження для server.py: багато ботів грають одночасно.
+
+Кожен бот відкриває сесію, грає games ігор випадковою стратегією (постріл у
+випадкову суміжну печеру при запаху, інакше випадковий рух) і закриває
+з'єднання. Затримка ходу - час від надсилання команди до отримання рядка
+STATE. Результат: сесій і ходів за секунду та перцентилі затримки.
+
+    python loadgen.py --sessions 2000 --concurrency 200 --start-server
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from server import GameServer
+
+
+async def read_state(reader):
+    """Читає рядки відповіді до STATE; повертає стан (словник) або None, якщо сесію закрито."""
+    while True:
+        line = await reader.readline()
+        if not line or line.startswith(b"BYE"):
+            return None
+        if line.startswith(b"STATE "):
+            return json.loads(line[6:])
+
+
+async def bot(host, port, games, rng, latencies, max_steps=1000):
+    """Одна сесія: games ігор; затримки ходів дописуються в latencies. Повертає кількість зіграних ігор."""
+    reader, writer = await asyncio.open_connection(host, port)
+    played = 0
+    try:
+        state = await read_state(reader)
+        steps = 0
+        while state is not None and played < games:
+            if state["done"] or steps >= max_steps:
+                played += 1
+                steps = 0
+                command = "new" if played < games else "quit"
+            else:
+                target = rng.choice(state["neighbors"])
+                command = f"shoot {target}" if state["stench"] else f"move {target}"
+                steps += 1
+            started = time.perf_counter()
+            writer.write((command + "\n").encode())
+            await writer.drain()
+            state = await read_state(reader)
+            if command != "quit":
+                latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+    return played
+
+
+async def run_load(host, port, sessions=1000, concurrency=100, games=1, seed=0):
+    """
+    Проганяє sessions сесій, не більше concurrency одночасно.
+    Повертає словник: сесій, ігор і ходів, час, сесій/с, ходів/с і затримки (мс).
+    """
+    rng = random.Random(seed)
+    latencies = []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def limited(bot_rng):
+        async with limit:
+            return await bot(host, port, games, bot_rng, latencies)
+
+    started = time.perf_counter()
+    played = await asyncio.gather(*(limited(random.Random(rng.getrandbits(64))) for _ in range(sessions)))
+    elapsed = time.perf_counter() - started
+    milliseconds = np.array(latencies) * 1000
+    return {
+        "sessions": sessions,
+        "games": sum(played),
+        "turns": len(latencies),
+        "seconds": elapsed,
+        "sessions_per_sec": sessions / elapsed,
+        "turns_per_sec": len(latencies) / elapsed,
+        "latency_ms": {f"p{q}": float(np.percentile(milliseconds, q)) for q in (50, 90, 99)} if latencies else {},
+    }
+
+
+async def run_local(sessions, concurrency, games, seed):
+    """Запускає сервер у цьому ж циклі подій на вільному порту і навантажує його."""
+    server = GameServer(port=0, seed=seed)
+    port = await server.start()
+    try:
+        return await run_load("127.0.0.1", port, sessions, concurrency, games, seed)
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генератор навантаження для сервера «Світу Вампусу»")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=1000, help="загальна кількість сесій")
+    parser.add_argument("--concurrency", type=int, default=100, help="одночасних сесій")
+    parser.add_argument("--games", type=int, default=1, help="ігор у кожній сесії")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-server", action="store_true",
+                        help="запустити сервер у цьому ж процесі (затримки включають роботу клієнтів)")
+    args = parser.parse_args()
+
+    if args.start_server:
+        result = asyncio.run(run_local(args.sessions, args.concurrency, args.games, args.seed))
+    else:
+        result = asyncio.run(run_load(args.host, args.port, args.sessions, args.concurrency, args.games, args.seed))
+    latency = ", ".join(f"{name} {value:.2f} мс" for name, value in result["latency_ms"].items())
+    print(f"Сесій: {result['sessions']} ({result['sessions_per_sec']:.0f}/с), ігор: {result['games']}, "
+          f"ходів: {result['turns']} ({result['turns_per_sec']:.0f}/с)")
+    print(f"Затримка ходу: {latency}")
+
+
+if __name__ == "__main__":
+    main()
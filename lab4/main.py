@@ -1,104 +1,139 @@
 import random
 
+from caves import CaveGraph
 
-class HuntTheWumpus:
-    def __init__(self):
-        # Карта печер (20 вершин додекаедра).
-        # Кожна печера (ключ словника) має список суміжних печер.
-        self.cave_map = {
-            1: [2, 5, 8],
-            2: [1, 3, 10],
-            3: [2, 4, 12],
-            4: [3, 5, 14],
-            5: [1, 4, 6],
-            6: [5, 7, 15],
-            7: [16, 8, 17],
-            8: [1, 7, 9],
-            9: [8, 10, 18],
-            10: [2, 9, 11],
-            11: [10, 12, 19],
-            12: [3, 11, 13],
-            13: [12, 14, 20],
-            14: [4, 13, 15],
-            15: [6, 14, 16],
-            16: [15, 17, 20],
-            17: [7, 16, 18],
-            18: [9, 17, 19],
-            19: [11, 18, 20],
-            20: [13, 16, 19]
-        }
+# Причини завершення гри (HuntTheWumpus.outcome; індекс - код у vector.py)
+OUTCOMES = (None, "won", "wumpus", "pit", "arrow", "wumpus_moved", "no_arrows")
 
-        # Визначаємо позиції небезпек.
-        # Створюємо список печер, перемішуємо і розподіляємо.
-        caves = list(self.cave_map.keys())
-        random.shuffle(caves)
-        self.wumpus = caves.pop()  # Вампус займає одну печеру.
+
+class HuntTheWumpus:
+    def __init__(self, seed=None, output=print, caves=None):
+        """
+        seed    - зерно генератора випадкових чисел гри (None - випадкове)
+        output  - функція для повідомлень гравцю (None - гра без виводу, для агентів)
+        caves   - граф печер caves.CaveGraph (None - класична карта caves.CAVE_MAP)
+        """
+        self.random = random.Random(seed)
+        self.output = output
+        self.caves = CaveGraph.dodecahedron() if caves is None else caves
+
+        # Визначаємо позиції небезпек: п'ять різних випадкових печер
+        # (вибірка без перемішування всього списку, тож працює і для великих карт).
+        hazards = self.random.sample(self.caves.caves(), 5)
+        self.wumpus = hazards.pop()  # Вампус займає одну печеру.
         # Дві ями (bottomless pits)
-        self.pits = [caves.pop(), caves.pop()]
+        self.pits = [hazards.pop(), hazards.pop()]
         # Дві печери з супер кажанами
-        self.bats = [caves.pop(), caves.pop()]
+        self.bats = [hazards.pop(), hazards.pop()]
 
         # Початкова позиція гравця: вибираємо випадкову печеру, що не містить небезпек.
         while True:
-            start = random.choice(list(self.cave_map.keys()))
+            start = self.random.randint(1, self.caves.size)
             if start != self.wumpus and start not in self.pits and start not in self.bats:
                 self.player = start
                 break
 
         self.arrows = 5  # Кількість стріл
         self.game_over = False  # Прапорець завершення гри
+        self.outcome = None  # Причина завершення (одна з OUTCOMES)
+
+    def say(self, *text):
+        """Передає повідомлення гравцю (якщо вивід увімкнено)."""
+        if self.output:
+            self.output(*text)
+
+    def finish(self, outcome):
+        """Завершує гру з указаною причиною (перша причина зберігається)."""
+        if not self.game_over:
+            self.outcome = outcome
+        self.game_over = True
+
+    def observe(self):
+        """
+        Спостереження гравця: поточна печера, суміжні печери, відчуття від
+        небезпек у суміжних печерах (запах Вампуса, протяг від ями, шелест
+        кажанів) і кількість стріл.
+        """
+        return {
+            "cave": self.player,
+            "neighbors": tuple(self.caves.neighbors(self.player).tolist()),
+            "stench": self.caves.adjacent(self.player, self.wumpus),
+            "breeze": self.caves.within(self.player, self.pits),
+            "rustle": self.caves.within(self.player, self.bats),
+            "arrows": self.arrows,
+        }
+
+    def step(self, action, target):
+        """
+        Один хід без введення з консолі.
+
+        action - "move" (target - номер печери) або "shoot" (target - список від 1 до 5
+                 печер, через які має пройти стріла)
+        Повертає (спостереження, винагорода, гра завершена): винагорода 1 за перемогу,
+        -1 за поразку, 0 інакше.
+        """
+        if self.game_over:
+            raise ValueError("Гра вже завершена")
+        if action == "move":
+            self.move_player(target)
+        elif action == "shoot":
+            if not 1 <= len(target) <= 5:
+                raise ValueError("Стріла має пройти від 1 до 5 печер")
+            self.shoot_arrow(target)
+        else:
+            raise ValueError(f"Невідома дія {action!r}, очікується 'move' або 'shoot'")
+        reward = 0
+        if self.game_over:
+            reward = 1 if self.outcome == "won" else -1
+        return self.observe(), reward, self.game_over
 
     def show_status(self):
         """Виводить інформацію про поточну печеру, суміжні печери та дає підказки про небезпеки."""
-        print("\nВи зараз у печері", self.player)
-        print("Тунелі ведуть до: " + ", ".join(str(cave) for cave in self.cave_map[self.player]))
+        observation = self.observe()
+        self.say("\nВи зараз у печері", observation["cave"])
+        self.say("Тунелі ведуть до: " + ", ".join(str(cave) for cave in observation["neighbors"]))
 
         # Підказки, якщо в суміжних печерах є небезпеки.
-        warnings = []
-        for adj in self.cave_map[self.player]:
-            if adj == self.wumpus:
-                warnings.append("Ви відчуваєте страшний запах!")
-            if adj in self.pits:
-                warnings.append("Відчувається протяг холодного повітря (підказка про яму)!")
-            if adj in self.bats:
-                warnings.append("Чуєте швидкий шелест крил (можливо, кажани поряд)!")
-        # Вивід підказок без повторень.
-        for warn in set(warnings):
-            print(warn)
+        if observation["stench"]:
+            self.say("Ви відчуваєте страшний запах!")
+        if observation["breeze"]:
+            self.say("Відчувається протяг холодного повітря (підказка про яму)!")
+        if observation["rustle"]:
+            self.say("Чуєте швидкий шелест крил (можливо, кажани поряд)!")
 
     def move_player(self, destination):
         """Обробка пересування гравця у вибрану печеру."""
-        if destination not in self.cave_map[self.player]:
-            print("Ви не можете безпосередньо потрапити до печери", destination)
+        if not self.caves.adjacent(self.player, destination):
+            self.say("Ви не можете безпосередньо потрапити до печери", destination)
             return
 
         self.player = destination
 
         # Перевіряємо, чи не потрапив гравець у печеру з небезпекою.
         if self.player == self.wumpus:
-            print("Ви натрапили на Вампуса!")
-            print("Вампус напав на вас – ви програли!")
-            self.game_over = True
+            self.say("Ви натрапили на Вампуса!")
+            self.say("Вампус напав на вас – ви програли!")
+            self.finish("wumpus")
             return
 
         if self.player in self.pits:
-            print("Ви впали в бездонну яму – гра завершена!")
-            self.game_over = True
+            self.say("Ви впали в бездонну яму – гра завершена!")
+            self.finish("pit")
             return
 
         while self.player in self.bats:
-            print("Супер кажани зловили вас і перенесли у випадкову печеру!")
+            self.say("Супер кажани зловили вас і перенесли у випадкову печеру!")
             # Переносимо гравця у випадкову печеру.
-            self.player = random.choice(list(self.cave_map.keys()))
-            print("Вас випустили у печері", self.player)
+            self.player = self.random.randint(1, self.caves.size)
+            self.say("Вас випустили у печері", self.player)
             # Після перенесення перевіряємо повторно:
             if self.player == self.wumpus:
-                print("На жаль, у цій печері чекає Вампус – ви програли!")
-                self.game_over = True
+                self.say("На жаль, у цій печері чекає Вампус – ви програли!")
+                self.finish("wumpus")
                 return
             if self.player in self.pits:
-                print("Ви опинилися у ямі після перенесення – гра завершена!")
-                self.game_over = True
+                self.say("Ви опинилися у ямі після перенесення – гра завершена!")
+                self.finish("pit")
                 return
 
 
@@ -113,38 +148,38 @@ class HuntTheWumpus:
         for next_cave in path:
             # Якщо задана печера не суміжна з поточною,
             # вибираємо випадкову суміжну печеру.
-            if next_cave not in self.cave_map[current]:
-                print(f"Стріла не може прямувати до печери {next_cave} з печери {current}.")
-                next_cave = random.choice(self.cave_map[current])
-                print(f"Стріла була відхилена до печери {next_cave}.")
+            if not self.caves.adjacent(current, next_cave):
+                self.say(f"Стріла не може прямувати до печери {next_cave} з печери {current}.")
+                next_cave = self.random.choice(self.caves.neighbors(current).tolist())
+                self.say(f"Стріла була відхилена до печери {next_cave}.")
             current = next_cave
 
             # Перевірка чи влучила стріла:
             if current == self.wumpus:
-                print("Ваша стріла влучила у Вампуса! Ви перемогли!")
-                self.game_over = True
+                self.say("Ваша стріла влучила у Вампуса! Ви перемогли!")
+                self.finish("won")
                 return
             if current == self.player:
-                print("Стріла повернулася і влучила у вас – гра завершена!")
-                self.game_over = True
+                self.say("Стріла повернулася і влучила у вас – гра завершена!")
+                self.finish("arrow")
                 return
 
         # Якщо стріла не влучила у нічого.
-        print("Стріла промахнулася!")
+        self.say("Стріла промахнулася!")
 
         # Вампус може пересунутися після пострілу (з ймовірністю 75%).
-        if random.random() < 0.75:
-            new_wumpus = random.choice(self.cave_map[self.wumpus])
-            print(f"Вампус несподівано перемістився з печери {self.wumpus} до печери {new_wumpus}!")
+        if self.random.random() < 0.75:
+            new_wumpus = self.random.choice(self.caves.neighbors(self.wumpus).tolist())
+            self.say(f"Вампус несподівано перемістився з печери {self.wumpus} до печери {new_wumpus}!")
             self.wumpus = new_wumpus
             if self.wumpus == self.player:
-                print("Вампус перемістився безпосередньо у вашу печеру і напав – гра завершена!")
-                self.game_over = True
+                self.say("Вампус перемістився безпосередньо у вашу печеру і напав – гра завершена!")
+                self.finish("wumpus_moved")
 
         self.arrows -= 1
         if self.arrows <= 0:
-            print("Ви витратили всі стріли – гра завершена!")
-            self.game_over = True
+            self.say("Ви витратили всі стріли – гра завершена!")
+            self.finish("no_arrows")
 
     def play(self):
         """Основний ігровий цикл."""
@@ -179,7 +214,7 @@ class HuntTheWumpus:
                         cave = int(input(f"Печера {i + 1}: "))
                     except ValueError:
                         print("Невірний номер, виберемо випадкове значення.")
-                        cave = random.choice(self.cave_map[self.player])
+                        cave = self.random.choice(self.caves.neighbors(self.player).tolist())
                     arrow_path.append(cave)
                 self.shoot_arrow(arrow_path)
             else:
@@ -0,0 +1,408 @@
+"""
+Планувальник expectimax для «Світу Вампусу» на малих картах (класична - 20 печер).
+
+Стан знань гравця - Knowledge: печера, стріли, маски відвіданих печер,
+відчуттів і перенесень кажанами (бітові маски, біт c - печера c) та історія
+пострілів. Знання однозначно визначають розподіл положень небезпек (з
+точністю до округлення - умови накладаються в різному порядку), тому стан
+кодується одним цілим числом (Knowledge.key) і оцінки зберігаються в таблиці
+транспозицій з обмеженим розміром (LRU).
+
+Розподіл небезпек зберігається трьома масивами: ймовірності печер Вампуса та
+ймовірності пар печер для ям і для кажанів. Кожне відчуття залежить лише від
+одного виду небезпек, тож кожен масив - точний апостеріорний розподіл свого
+виду; наближення лише в тому, що не враховується заборона небезпекам різних
+видів займати одну печеру. Переходи повторюють правила HuntTheWumpus:
+
+  рух             - загибель (Вампус, яма), кажани (гравець опиняється в
+                    рівномірно випадковій печері без кажанів - саме туди
+                    приводить цикл перенесень move_player) або нове спостереження
+  постріл         - перемога або промах: Вампус переходить у суміжну печеру з
+                    ймовірністю 0.75 (множення на матрицю переходів), витрачається
+                    стріла, потім нове спостереження запаху
+
+Стріла летить в одну суміжну печеру. Глибина пошуку обмежена; незавершена гра
+на межі глибини оцінюється як постріл у найімовірнішу печеру Вампуса, а після
+промаху - leaf_value на кожну з решти стріл (що точніше відомий Вампус, то
+ближча перемога). Кожен наступний хід множиться на discount. Після перенесення
+кажанами пошук не продовжується: приземлення в кожну печеру оцінюється так
+само, як межа глибини. Щоб гравець не ходив колами між безпечними печерами,
+на корені рух дешевшає на explore_penalty за кожен попередній візит у печеру.
+
+    python planner.py --games 200 --depth 2
+"""
+
+import argparse
+import time
+from collections import Counter, OrderedDict, namedtuple
+
+import numpy as np
+
+from caves import CaveGraph
+from main import HuntTheWumpus, OUTCOMES
+
+# На більших картах пари печер і глибина пошуку стають задорогими
+MAX_CAVES = 64
+WUMPUS_MOVE_PROB = 0.75
+
+
+class Knowledge(namedtuple("Knowledge", "player arrows visited breeze rustle bats seen stench carried history")):
+    """
+    Знання гравця:
+
+    visited  - печери, де гравець побував живим (там немає ям і кажанів)
+    breeze   - відвідані печери, де відчувався протяг
+    rustle   - відвідані печери, де чувся шелест
+    bats     - печери, звідки гравця переносили кажани
+    seen     - печери, де гравець був після останнього пострілу (там немає Вампуса)
+    stench   - печери з seen, де відчувався запах
+    carried  - печери, звідки гравця переносили кажани після останнього пострілу
+               (там немає Вампуса; bats для цього не досить - Вампус переходить)
+    history  - маски seen, stench і carried до кожного пострілу та ціль пострілу
+    """
+
+    __slots__ = ()
+
+    def key(self, width):
+        """Ціле число, що однозначно кодує знання (width - біт на маску)."""
+        key = self.history
+        for field in (self.visited, self.breeze, self.rustle, self.bats, self.seen, self.stench, self.carried,
+                      self.player):
+            key = key << width | field
+        return key << 4 | self.arrows
+
+
+def _condition(probabilities, selected):
+    """Розподіл probabilities за умови selected та ймовірність цієї умови."""
+    kept = np.where(selected, probabilities, 0.0)
+    mass = float(kept.sum())
+    return (kept / mass if mass > 0.0 else kept), mass
+
+
+class ExpectimaxPlanner:
+    """
+    Пошук найкращої дії за ймовірністю перемоги.
+
+    Стан пошуку - (Knowledge, ймовірності Вампуса, ймовірності пар ям,
+    ймовірності пар кажанів).
+
+    caves            - граф печер (None - класична карта); всі печери з однаковим степенем
+    depth            - глибина пошуку в ходах
+    table_size       - найбільша кількість записів таблиці транспозицій
+    leaf_value       - оцінка незавершеної гри після промаху (на кожну наступну стрілу)
+    discount         - множник значення кожного наступного ходу
+    explore_penalty  - штраф кореневому руху за кожен попередній візит у печеру
+    """
+
+    def __init__(self, caves=None, depth=2, table_size=200000, leaf_value=0.6, discount=0.97,
+                 explore_penalty=0.02):
+        self.caves = CaveGraph.dodecahedron() if caves is None else caves
+        if self.caves.size > MAX_CAVES:
+            raise ValueError(f"Планувальник підтримує карти до {MAX_CAVES} печер")
+        self.size = size = self.caves.size
+        self.width = size + 1
+        adjacency = self.caves.adjacency_array()
+        degree = adjacency.shape[1]
+
+        # Матриця переходів Вампуса після промаху: рядок - звідки, стовпець - куди
+        self.relocation = np.zeros((size + 1, size + 1))
+        self.relocation[np.arange(1, size + 1), np.arange(1, size + 1)] = 1.0 - WUMPUS_MOVE_PROB
+        for cave in range(1, size + 1):
+            for neighbor in adjacency[cave]:
+                self.relocation[cave, neighbor] += WUMPUS_MOVE_PROB / degree
+
+        # Усі пари печер для двох ям і двох кажанів
+        first, second = np.triu_indices(size, 1)
+        first, second = first + 1, second + 1
+        caves = np.arange(size + 1)
+        self.near = np.zeros((size + 1, size + 1), dtype=bool)
+        for cave in range(1, size + 1):
+            self.near[cave, adjacency[cave]] = True
+        # contains[c] - пари з печерою c, pair_near[c] - пари з печерою, суміжною з c
+        self.contains = (first[None, :] == caves[:, None]) | (second[None, :] == caves[:, None])
+        self.pair_near = self.near[:, first] | self.near[:, second]
+        self.pairs = len(first)
+
+        self.depth = depth
+        self.table_size = table_size
+        self.leaf_value = leaf_value
+        self.discount = discount
+        self.explore_penalty = explore_penalty
+        self.table = OrderedDict()
+        self.nodes = self.hits = self.lookups = 0
+
+    def start(self, observation, arrows=5):
+        """Початковий стан пошуку для першого спостереження гри."""
+        player, bit = observation["cave"], 1 << observation["cave"]
+        wumpus = np.full(self.size + 1, 1.0 / self.size)
+        wumpus[0] = 0.0
+        pairs = np.full(self.pairs, 1.0 / self.pairs)
+        knowledge = Knowledge(player, arrows, bit, 0, 0, 0, bit, 0, 0, 0)
+        state = self._alive((knowledge, wumpus, pairs, pairs), player)
+        return self._child(state, player, self._observation_code(observation))
+
+    @staticmethod
+    def _observation_code(observation):
+        return int(observation["stench"]) | int(observation["breeze"]) << 1 | int(observation["rustle"]) << 2
+
+    def _alive(self, state, cave):
+        """Стан за умови, що в печері cave немає жодної небезпеки."""
+        knowledge, wumpus, pits, bats = state
+        wumpus, _ = _condition(wumpus, np.arange(self.size + 1) != cave)
+        pits, _ = _condition(pits, ~self.contains[cave])
+        bats, _ = _condition(bats, ~self.contains[cave])
+        return knowledge, wumpus, pits, bats
+
+    def _sense(self, state, cave):
+        """Ймовірності кодів спостереження в печері cave (гравець там живий)."""
+        _, wumpus, pits, bats = state
+        stench = float(wumpus[self.near[cave]].sum())
+        breeze = float(pits[self.pair_near[cave]].sum())
+        rustle = float(bats[self.pair_near[cave]].sum())
+        masses = {}
+        for code in range(8):
+            mass = ((stench if code & 1 else 1.0 - stench) * (breeze if code & 2 else 1.0 - breeze) *
+                    (rustle if code & 4 else 1.0 - rustle))
+            if mass > 1e-12:
+                masses[code] = mass
+        return masses
+
+    def _child(self, state, cave, code, full=True):
+        """
+        Стан після спостереження code у печері cave. Якщо не full - лише
+        розподіл Вампуса (досить для оцінки leaf на межі глибини).
+        """
+        knowledge, wumpus, pits, bats = state
+        wumpus, _ = _condition(wumpus, self.near[cave] if code & 1 else ~self.near[cave])
+        if not full:
+            return knowledge, wumpus, None, None
+        bit = 1 << cave
+        pits, _ = _condition(pits, self.pair_near[cave] if code & 2 else ~self.pair_near[cave])
+        bats, _ = _condition(bats, self.pair_near[cave] if code & 4 else ~self.pair_near[cave])
+        knowledge = knowledge._replace(
+            player=cave,
+            visited=knowledge.visited | bit,
+            breeze=knowledge.breeze | (bit if code & 2 else 0),
+            rustle=knowledge.rustle | (bit if code & 4 else 0),
+            seen=knowledge.seen | bit,
+            stench=knowledge.stench | (bit if code & 1 else 0),
+        )
+        return knowledge, wumpus, pits, bats
+
+    def transitions(self, state, action, target, full=True):
+        """
+        Результати дії: список (ймовірність, результат, стан або значення), де
+        результат - "won"/"lost", ("move", код спостереження), "bats" (гравця
+        перенесли кажани; стан - None, див. advance) або ("miss", код
+        спостереження); для завершених ігор замість стану - 1.0 або 0.0.
+        """
+        knowledge, wumpus, pits, bats = state
+        results = []
+        if action == "move":
+            alive = (1.0 - wumpus[target]) * (1.0 - float(pits[self.contains[target]].sum()))
+            carried = float(bats[self.contains[target]].sum())
+            results.append((1.0 - alive, "lost", 0.0))
+            if alive * (1.0 - carried) > 0.0:
+                safe = self._alive(state, target)
+                for code, mass in self._sense(safe, target).items():
+                    results.append((alive * (1.0 - carried) * mass, ("move", code),
+                                    self._child(safe, target, code, full)))
+            results.append((alive * carried, "bats", None))
+        else:
+            results.append((float(wumpus[target]), "won", 1.0))
+            if wumpus[target] < 1.0:
+                results += self._miss(state, target, 1.0 - float(wumpus[target]))
+        return [result for result in results if result[0] > 0.0]
+
+    def _carried(self, state, target):
+        """Стан за умови, що в печері target кажани (і немає Вампуса та ями)."""
+        knowledge, wumpus, pits, bats = state
+        wumpus, _ = _condition(wumpus, np.arange(self.size + 1) != target)
+        pits, _ = _condition(pits, ~self.contains[target])
+        bats, _ = _condition(bats, self.contains[target])
+        bit = 1 << target
+        return knowledge._replace(bats=knowledge.bats | bit, carried=knowledge.carried | bit), wumpus, pits, bats
+
+    def _carry_value(self, state, target):
+        """
+        Оцінка після перенесення кажанами з печери target: печера приземлення
+        рівномірно випадкова серед печер без кажанів, далі пошук не йде - кожне
+        приземлення оцінюється leaf (для всіх печер одразу, векторно).
+        """
+        knowledge, wumpus, pits, bats = self._carried(state, target)
+        landed = 1.0 - self.contains @ bats
+        landed[0] = 0.0
+        alive = (1.0 - wumpus) * (1.0 - self.contains @ pits)
+        # Найбільша ймовірність Вампуса після виключення печери приземлення
+        first = int(wumpus.argmax())
+        best = np.full(self.size + 1, wumpus[first])
+        best[first] = np.partition(wumpus, -2)[-2]
+        best /= np.maximum(1.0 - wumpus, 1e-12)
+        leaf = self._leaf(best, knowledge.arrows)
+        return float((landed * alive * leaf).sum()) / (self.size - 2)
+
+    def _land(self, state, target, cave, code):
+        """Стан після перенесення кажанами з target у печеру cave зі спостереженням code."""
+        knowledge, wumpus, pits, bats = self._carried(state, target)
+        bats, _ = _condition(bats, ~self.contains[cave])
+        safe = self._alive((knowledge, wumpus, pits, bats), cave)
+        return self._child(safe, cave, code)
+
+    def _miss(self, state, target, probability):
+        """Промах: Вампус переходить, витрачається стріла, гравець відчуває запах чи ні."""
+        knowledge, wumpus, pits, bats = state
+        wumpus, _ = _condition(wumpus, np.arange(self.size + 1) != target)
+        wumpus = wumpus @ self.relocation
+        player = knowledge.player
+        killed = float(wumpus[player])
+        results = [(probability * killed, "lost", 0.0)]
+        if knowledge.arrows <= 1:
+            # Остання стріла - гра завершена (no_arrows)
+            results.append((probability * (1.0 - killed), "lost", 0.0))
+            return results
+        wumpus, alive = _condition(wumpus, np.arange(self.size + 1) != player)
+        history = knowledge.history
+        for mask in (knowledge.seen, knowledge.stench, knowledge.carried):
+            history = history << self.width | mask
+        history <<= self.width
+        for code in (1, 0):
+            child, mass = _condition(wumpus, self.near[player] if code else ~self.near[player])
+            if mass > 0.0:
+                bit = 1 << player
+                child_knowledge = knowledge._replace(arrows=knowledge.arrows - 1, seen=bit,
+                                                     stench=bit if code else 0, carried=0, history=history | target)
+                results.append((probability * alive * mass, ("miss", code), (child_knowledge, child, pits, bats)))
+        return results
+
+    def actions(self, knowledge):
+        """Доступні дії: рух у суміжну печеру та (якщо є стріли) постріл у неї."""
+        neighbors = self.caves.neighbors(knowledge.player).tolist()
+        moves = [("move", cave) for cave in neighbors]
+        return moves + ([("shoot", cave) for cave in neighbors] if knowledge.arrows > 0 else [])
+
+    def _leaf(self, wumpus_max, arrows):
+        # Постріл у найімовірнішу печеру, а після промаху - leaf_value на решту стріл
+        return wumpus_max + (1.0 - wumpus_max) * self.leaf_value * (arrows - 1) / max(arrows, 1)
+
+    def leaf(self, state):
+        """Оцінка незавершеної гри на межі глибини пошуку."""
+        return self._leaf(float(state[1].max()), state[0].arrows)
+
+    def _action_value(self, state, action, target, depth):
+        value = 0.0
+        for probability, outcome, child in self.transitions(state, action, target, depth > 1):
+            if outcome == "bats":
+                value += probability * self.discount * self._carry_value(state, target)
+            elif isinstance(child, float):
+                value += probability * child
+            else:
+                value += probability * self.discount * self.value(child, depth - 1)
+        return value
+
+    def value(self, state, depth):
+        """Оцінка ймовірності перемоги зі стану state при пошуку на depth ходів."""
+        self.nodes += 1
+        if depth <= 0:
+            return self.leaf(state)
+        key = state[0].key(self.width) << 4 | depth
+        self.lookups += 1
+        if key in self.table:
+            self.hits += 1
+            self.table.move_to_end(key)
+            return self.table[key]
+        value = max(self._action_value(state, action, target, depth) for action, target in self.actions(state[0]))
+        self.table[key] = value
+        if len(self.table) > self.table_size:
+            self.table.popitem(last=False)
+        return value
+
+    def decide(self, state, visits=None):
+        """
+        Найкраща дія зі стану state; visits - скільки разів гравець уже був у
+        кожній печері (словник), рух туди дешевшає на explore_penalty за візит.
+        Повертає ((дія, ціль), статистика), де статистика - оцінка ймовірності
+        перемоги, кількість вузлів, звернень до таблиці та частка влучань у
+        таблицю за це рішення, розмір таблиці і час.
+        """
+        started = time.perf_counter()
+        nodes, hits, lookups = self.nodes, self.hits, self.lookups
+        self.nodes += 1
+        best, best_score, best_value = None, 0.0, 0.0
+        for action, target in self.actions(state[0]):
+            value = self._action_value(state, action, target, self.depth)
+            score = value - (self.explore_penalty * visits.get(target, 0) if visits and action == "move" else 0.0)
+            if best is None or score > best_score:
+                best, best_score, best_value = (action, target), score, value
+        lookups = self.lookups - lookups
+        hits = self.hits - hits
+        return best, {
+            "win_probability": best_value,
+            "nodes": self.nodes - nodes,
+            "lookups": lookups,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "table_size": len(self.table),
+            "seconds": time.perf_counter() - started,
+        }
+
+    def advance(self, state, action, target, observation):
+        """Стан після дії в грі: результат переходу, що відповідає спостереженню observation."""
+        code = self._observation_code(observation)
+        if action == "move" and observation["cave"] != target:
+            return self._land(state, target, observation["cave"], code)
+        expected = ("miss", int(observation["stench"])) if action == "shoot" else ("move", code)
+        for _, outcome, child in self.transitions(state, action, target):
+            if outcome == expected:
+                return child
+        raise ValueError(f"Спостереження {observation} неможливе для дії {action} {target}")
+
+
+def play(game, planner, max_steps=200):
+    """Грає гру game планувальником; повертає (причина завершення, список статистик рішень)."""
+    observation = game.observe()
+    state = planner.start(observation, game.arrows)
+    visits = Counter([observation["cave"]])
+    decisions = []
+    for _ in range(max_steps):
+        (action, target), stats = planner.decide(state, visits)
+        decisions.append(stats)
+        observation, _, done = game.step(action, [target] if action == "shoot" else target)
+        if done:
+            break
+        visits[observation["cave"]] += 1
+        state = planner.advance(state, action, target, observation)
+    return game.outcome, decisions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Гра планувальника expectimax у «Світ Вампусу»")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--table-size", type=int, default=200000)
+    parser.add_argument("--verbose", action="store_true", help="виводити статистику кожного рішення")
+    args = parser.parse_args()
+
+    planner = ExpectimaxPlanner(depth=args.depth, table_size=args.table_size)
+    outcomes = Counter()
+    decisions = []
+    started = time.perf_counter()
+    for index in range(args.games):
+        outcome, stats = play(HuntTheWumpus(args.seed + index, output=None), planner)
+        outcomes[outcome] += 1
+        decisions += stats
+        if args.verbose:
+            for decision in stats:
+                print(decision)
+    elapsed = time.perf_counter() - started
+
+    print(f"Ігор: {args.games}, перемог: {outcomes['won'] / args.games:.2%}, рішень: {len(decisions)}, "
+          f"{elapsed / len(decisions) * 1000:.1f} мс на рішення")
+    print(f"Вузлів на рішення: {np.mean([d['nodes'] for d in decisions]):.0f}, "
+          f"влучань у таблицю: {np.mean([d['hit_rate'] for d in decisions]):.1%}, "
+          f"записів у таблиці: {len(planner.table)}")
+    for name in OUTCOMES:
+        print(f"  {'running' if name is None else name}: {outcomes[name]}")
+
+
+if __name__ == "__main__":
+    main()
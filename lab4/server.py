@@ -0,0 +1,193 @@
+"""
+Сервер «Світу Вампусу» на asyncio: багато одночасних гравців в одному процесі.
+
+Кожне TCP-з'єднання - окрема сесія з власною грою HuntTheWumpus. Повідомлення
+гри не друкуються, а збираються через output і надсилаються гравцю. Протокол
+рядковий (UTF-8), команди:
+
+    move N            (або m N)   - перейти в печеру N
+    shoot A [B ...]   (або s ...) - вистрілити через печери A, B, ... (від 1 до 5)
+    status                        - повторити стан
+    new [SEED]                    - почати нову гру
+    quit                          - завершити сесію
+
+На кожну команду сервер відповідає рядками повідомлень гри (або рядком
+"ERROR ...") і завершальним рядком "STATE {json}": спостереження
+(HuntTheWumpus.observe), done, outcome і reward. Сесія, що не надсилала команд
+idle_timeout секунд, закривається (рядок "BYE idle"), як і сесія, що стільки ж
+не читає відповіді. Рядок, довший за 64 КіБ, закриває сесію ("ERROR line too long").
+
+    python server.py --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import random
+
+from caves import CaveGraph
+from main import HuntTheWumpus
+
+
+class Session:
+    """Гра одного з'єднання: команди рядками, відповідь - список рядків."""
+
+    def __init__(self, seed=None, caves=None):
+        self.messages = []
+        self.reward = 0
+        self.caves = caves
+        self.new_game(seed)
+
+    def say(self, *text):
+        self.messages.append(" ".join(str(part) for part in text))
+
+    def new_game(self, seed=None):
+        self.game = HuntTheWumpus(seed, output=self.say, caves=self.caves)
+        self.reward = 0
+        self.say("Вітаємо у грі «Світ Вампусу»!")
+        self.game.show_status()
+
+    def state(self):
+        state = self.game.observe()
+        state.update(done=self.game.game_over, outcome=self.game.outcome, reward=self.reward)
+        return "STATE " + json.dumps(state, ensure_ascii=False)
+
+    def handle(self, line):
+        """Виконує команду line; повертає (рядки відповіді, чи закрити сесію)."""
+        words = line.split()
+        command, args = (words[0].lower(), words[1:]) if words else ("", [])
+        try:
+            if command in ("move", "m", "shoot", "s"):
+                if self.game.game_over:
+                    raise ValueError("Гра завершена, new - нова гра")
+                caves = [int(value) for value in args]
+                if command in ("move", "m"):
+                    if len(caves) != 1:
+                        raise ValueError("Формат: move N")
+                    _, self.reward, done = self.game.step("move", caves[0])
+                else:
+                    _, self.reward, done = self.game.step("shoot", caves)
+                if not done:
+                    self.game.show_status()
+            elif command == "new":
+                self.new_game(int(args[0]) if args else None)
+            elif command == "quit":
+                return ["BYE"], True
+            elif command != "status":
+                raise ValueError(f"Невідома команда {command!r}: move, shoot, status, new, quit")
+        except ValueError as error:
+            self.messages.append(f"ERROR {error}")
+        reply, self.messages = self.messages, []
+        return reply + [self.state()], False
+
+
+class GameServer:
+    """
+    TCP-сервер сесій.
+
+    idle_timeout  - секунд без команд (або без читання відповіді) до закриття сесії
+    max_sessions  - найбільша кількість одночасних сесій (нові з'єднання відхиляються)
+    seed          - зерно для зерен ігор сесій (None - випадкові ігри)
+    caves         - граф печер caves.CaveGraph, спільний для всіх ігор (None - класична карта)
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, idle_timeout=300.0, max_sessions=10000, seed=None,
+                 caves=None):
+        self.host, self.port = host, port
+        self.caves = CaveGraph.dodecahedron() if caves is None else caves
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.random = random.Random(seed)
+        self.sessions = 0
+        self.stats = {"connected": 0, "rejected": 0, "evicted": 0, "commands": 0}
+        self.server = None
+
+    async def start(self):
+        """Запускає сервер; повертає фактичний порт (для port=0 - вибраний системою)."""
+        self.server = await asyncio.start_server(self.serve, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def send(self, writer, lines):
+        """Надсилає рядки; клієнт, що не читає відповідь idle_timeout секунд, спричиняє TimeoutError."""
+        writer.write("".join(line + "\n" for line in lines).encode())
+        await asyncio.wait_for(writer.drain(), self.idle_timeout)
+
+    async def serve(self, reader, writer):
+        """Обслуговує одне з'єднання до quit, закриття або простою."""
+        if self.sessions >= self.max_sessions:
+            self.stats["rejected"] += 1
+            try:
+                await self.send(writer, ["BYE busy"])
+            except asyncio.TimeoutError:
+                writer.transport.abort()
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+            return
+        self.sessions += 1
+        self.stats["connected"] += 1
+        session = Session(self.random.getrandbits(64), self.caves)
+        try:
+            reply, _ = session.handle("status")
+            await self.send(writer, reply)
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    self.stats["evicted"] += 1
+                    await self.send(writer, ["BYE idle"])
+                    break
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Рядок довший за межу буфера StreamReader - межу рядка вже не знайти
+                    await self.send(writer, ["ERROR line too long", "BYE"])
+                    break
+                if not line:
+                    break
+                self.stats["commands"] += 1
+                reply, close = session.handle(line.decode(errors="replace"))
+                await self.send(writer, reply)
+                if close:
+                    break
+        except asyncio.TimeoutError:
+            # Клієнт не читає відповіді: close() чекав би на відправку буфера
+            self.stats["evicted"] += 1
+            writer.transport.abort()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервер «Світу Вампусу» для багатьох гравців")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="секунд простою до закриття сесії")
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--map", help="файл карти печер (див. caves.CaveGraph.load)")
+    args = parser.parse_args()
+
+    caves = CaveGraph.load(args.map) if args.map else None
+    server = GameServer(args.host, args.port, args.idle_timeout, args.max_sessions, args.seed, caves)
+    print(f"Сервер слухає {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Tests for the cave graph (run with `python -m pytest` from lab4)."""
+
+import pytest
+
+from caves import CAVE_MAP, CaveGraph
+
+
+def test_dodecahedron_matches_cave_map():
+    caves = CaveGraph.dodecahedron()
+    assert caves.size == 20
+    for cave, neighbors in CAVE_MAP.items():
+        assert caves.neighbors(cave).tolist() == neighbors
+    assert caves.regular_degree() == 3
+
+
+def test_small_lattice_has_distinct_neighbors():
+    caves = CaveGraph.lattice(2, 2)
+    for cave in caves.caves():
+        neighbors = caves.neighbors(cave).tolist()
+        assert len(neighbors) == len(set(neighbors)) == 2
+        assert cave not in neighbors
+
+
+def test_lattice_without_self_tunnels():
+    caves = CaveGraph.lattice(2, 5)
+    assert caves.neighbors(1).tolist() == [2, 3, 9]
+    line = CaveGraph.lattice(1, 4)
+    assert all(cave not in line.neighbors(cave).tolist() for cave in line.caves())
+    assert CaveGraph.lattice(4, 4).regular_degree() == 4
+
+
+def test_from_dict_rejects_unknown_caves():
+    with pytest.raises(ValueError):
+        CaveGraph.from_dict({1: [2, 3], 2: [1]})
+    with pytest.raises(ValueError):
+        CaveGraph.from_edges(2, [1], [3])
@@ -0,0 +1,225 @@
+"""
+Турнір стратегій «Світу Вампусу» на пулі процесів.
+
+Кожна стратегія грає однаковий набір ігор: зерно гри index виводиться з
+базового зерна та номера гри (numpy SeedSequence), тож розташування небезпек
+для всіх стратегій однакове і результат не залежить від кількості процесів.
+Ігри діляться на пачки по chunk; робочий процес повертає лічильники причин
+завершення пачки, а головний процес одразу дописує їх рядком JSON у файл
+результатів. Перший рядок файлу - параметри турніру. Після перезапуску з тим
+самим файлом уже зіграні пачки пропускаються (обірваний останній рядок
+відкидається).
+
+Для кожної причини завершення (won, wumpus, pit, arrow, wumpus_moved,
+no_arrows; running - гру зупинено після max_steps ходів) рахується частка
+ігор і довірчий інтервал Вільсона.
+
+    python tournament.py --strategies random belief planner --games 1000000 --output results.jsonl
+    python tournament.py --output results.jsonl --summary
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+from statistics import NormalDist
+
+import numpy as np
+
+import agent
+import planner
+from main import HuntTheWumpus, OUTCOMES
+
+STRATEGIES = ("random", "belief", "planner")
+CAUSES = tuple("running" if name is None else name for name in OUTCOMES)
+# Планувальник у кожному процесі один на всі ігри, щоб таблиця транспозицій накопичувалася
+_planners = {}
+
+
+def task_seed(seed, index):
+    """Зерно гри index турніру з базовим зерном seed."""
+    return int(np.random.SeedSequence([seed, index]).generate_state(1, np.uint64)[0] >> np.uint64(1))
+
+
+def random_walker(game, rng, max_steps=1000):
+    """Базова стратегія: постріл у випадкову суміжну печеру, якщо відчувається запах, інакше випадковий рух."""
+    observation = game.observe()
+    for _ in range(max_steps):
+        target = rng.choice(observation["neighbors"])
+        if observation["stench"]:
+            observation, _, done = game.step("shoot", [target])
+        else:
+            observation, _, done = game.step("move", target)
+        if done:
+            break
+    return game.outcome
+
+
+def play_game(strategy, seed, max_steps=1000, depth=1):
+    """Грає одну гру стратегією strategy; повертає причину завершення (див. CAUSES)."""
+    game = HuntTheWumpus(seed, output=None)
+    if strategy == "random":
+        outcome = random_walker(game, random.Random(seed), max_steps)
+    elif strategy == "belief":
+        outcome, _ = agent.play(game, max_steps)
+    elif strategy == "planner":
+        if depth not in _planners:
+            _planners[depth] = planner.ExpectimaxPlanner(depth=depth)
+        outcome, _ = planner.play(game, _planners[depth], max_steps)
+    else:
+        raise ValueError(f"Невідома стратегія {strategy!r}, доступні: {', '.join(STRATEGIES)}")
+    return "running" if outcome is None else outcome
+
+
+def run_chunk(task):
+    """Грає пачку ігор; повертає запис для файлу результатів."""
+    strategy, chunk, first, count, seed, max_steps, depth = task
+    started = time.perf_counter()
+    outcomes = Counter(play_game(strategy, task_seed(seed, index), max_steps, depth)
+                       for index in range(first, first + count))
+    return {"type": "chunk", "strategy": strategy, "chunk": chunk, "games": count,
+            "outcomes": dict(outcomes), "seconds": time.perf_counter() - started}
+
+
+def load_results(path):
+    """
+    Читає файл результатів. Повертає (параметри або None, список записів пачок).
+    Обірваний останній рядок (перерваний запис) відрізається з файлу.
+    """
+    if not os.path.exists(path):
+        return None, []
+    with open(path, "rb+") as file:
+        data = file.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            file.truncate(complete)
+    config, records = None, []
+    for line in data[:complete].splitlines():
+        record = json.loads(line)
+        if record["type"] == "config":
+            config = record
+        else:
+            records.append(record)
+    return config, records
+
+
+def run_tournament(output, strategies=STRATEGIES, games=10000, chunk=1000, seed=0, workers=None,
+                   max_steps=1000, depth=1):
+    """
+    Грає games ігор кожною стратегією, дописуючи результати пачок у файл output.
+
+    workers  - кількість процесів (None - os.cpu_count(), 1 - без пулу)
+    depth    - глибина пошуку стратегії planner
+    Якщо output уже містить результати турніру з тими самими параметрами,
+    зіграні пачки пропускаються. Повертає словник з кількістю зіграних зараз
+    ігор, часом і пропускною здатністю.
+    """
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Невідома стратегія {strategy!r}, доступні: {', '.join(STRATEGIES)}")
+    workers = workers or os.cpu_count()
+    config = {"type": "config", "games": games, "chunk": chunk, "seed": seed, "max_steps": max_steps, "depth": depth}
+    existing, records = load_results(output)
+    if existing is not None and {key: existing.get(key) for key in config} != config:
+        raise ValueError(f"{output} містить турнір з іншими параметрами: {existing}")
+    done = {(record["strategy"], record["chunk"]) for record in records}
+
+    tasks = [(strategy, index, index * chunk, min(chunk, games - index * chunk), seed, max_steps, depth)
+             for strategy in strategies
+             for index in range(math.ceil(games / chunk))
+             if (strategy, index) not in done]
+
+    started = time.perf_counter()
+    played = 0
+    with open(output, "a") as file:
+        if existing is None:
+            file.write(json.dumps(config) + "\n")
+            file.flush()
+        pool = Pool(workers) if workers > 1 else None
+        try:
+            results = pool.imap_unordered(run_chunk, tasks) if pool else map(run_chunk, tasks)
+            for record in results:
+                file.write(json.dumps(record) + "\n")
+                file.flush()
+                played += record["games"]
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+    elapsed = time.perf_counter() - started
+    return {"games": played, "skipped_chunks": len(done), "workers": workers, "time": elapsed,
+            "games_per_sec": played / elapsed if elapsed else None}
+
+
+def wilson_interval(successes, total, confidence=0.95):
+    """Довірчий інтервал Вільсона для частки successes / total."""
+    if not total:
+        return 0.0, 0.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = successes / total
+    denominator = 1 + z * z / total
+    centre = (rate + z * z / (2 * total)) / denominator
+    half = z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total)) / denominator
+    return max(centre - half, 0.0), min(centre + half, 1.0)
+
+
+def summarize(records, confidence=0.95):
+    """
+    Зводить записи пачок: для кожної стратегії - кількість ігор і для кожної
+    причини завершення кількість, частка та довірчий інтервал.
+    """
+    totals, games = {}, Counter()
+    for record in records:
+        totals.setdefault(record["strategy"], Counter()).update(record["outcomes"])
+        games[record["strategy"]] += record["games"]
+    summary = {}
+    for strategy, outcomes in totals.items():
+        total = games[strategy]
+        summary[strategy] = {"games": total, "outcomes": {}}
+        for cause in CAUSES:
+            low, high = wilson_interval(outcomes[cause], total, confidence)
+            summary[strategy]["outcomes"][cause] = {
+                "count": outcomes[cause], "rate": outcomes[cause] / total, "low": low, "high": high,
+            }
+    return summary
+
+
+def print_summary(summary, confidence=0.95):
+    print(f"{'стратегія':<10} {'ігор':>10}  " + "  ".join(f"{cause:>20}" for cause in CAUSES))
+    for strategy, result in summary.items():
+        cells = [f"{value['rate']:6.2%} [{value['low']:.2%}, {value['high']:.2%}]"
+                 for value in result["outcomes"].values()]
+        print(f"{strategy:<10} {result['games']:>10}  " + "  ".join(f"{cell:>20}" for cell in cells))
+    print(f"(у дужках - {confidence:.0%} довірчий інтервал Вільсона)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Турнір стратегій «Світу Вампусу»")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--games", type=int, default=10000, help="кількість ігор на стратегію")
+    parser.add_argument("--chunk", type=int, default=1000, help="ігор у пачці (одиниця запису та відновлення)")
+    parser.add_argument("--seed", type=int, default=0, help="базове зерно турніру")
+    parser.add_argument("--workers", type=int, default=None, help="кількість процесів (за замовчуванням - усі ядра)")
+    parser.add_argument("--max-steps", type=int, default=1000, help="найбільша кількість ходів у грі")
+    parser.add_argument("--depth", type=int, default=1, help="глибина пошуку стратегії planner")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--output", default="tournament.jsonl")
+    parser.add_argument("--summary", action="store_true", help="лише звести наявний файл результатів")
+    args = parser.parse_args()
+
+    if not args.summary:
+        result = run_tournament(args.output, args.strategies, args.games, args.chunk, args.seed,
+                                args.workers, args.max_steps, args.depth)
+        rate = f"{result['games_per_sec']:.0f} ігор/с" if result["games"] else "усі пачки вже зіграні"
+        print(f"{args.output}: {result['games']} ігор за {result['time']:.2f} с ({rate}, "
+              f"пропущено пачок: {result['skipped_chunks']}, процесів: {result['workers']})")
+    _, records = load_results(args.output)
+    print_summary(summarize(records, args.confidence), args.confidence)
+
+
+if __name__ == "__main__":
+    main()
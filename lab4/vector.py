@@ -0,0 +1,229 @@
+"""
+Векторизований рушій «Світу Вампусу»: тисячі ігор одночасно на масивах numpy.
+
+Стан кожної гри - позиції гравця, Вампуса, двох ям і двох кажанів, кількість
+стріл і код завершення (індекс у main.OUTCOMES). Правила ті самі, що в
+HuntTheWumpus, на будь-якому графі печер caves.CaveGraph з однаковою кількістю
+тунелів з кожної печери: кажани переносять у випадкову печеру, стріла з
+неправильним відрізком відхиляється у випадкову суміжну печеру, після промаху
+Вампус переходить у суміжну печеру з ймовірністю 0.75. На кожному ході
+обробляються лише ще не завершені ігри.
+
+Стратегія - функція policy(observation, rng) -> (kind, target, path), де
+observation - словник масивів (як VectorWumpus.observe()), kind - 0 (рух) або
+1 (постріл), target - печера для руху, path - масив n x 5 печер стріли
+(0 - кінець шляху).
+
+    python vector.py --games 1000000
+    python vector.py --games 100000 --caves 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from caves import CaveGraph
+from main import OUTCOMES
+
+MOVE, SHOOT = 0, 1
+MAX_ARROW_PATH = 5
+# Коди причин завершення (див. main.OUTCOMES)
+RUNNING, WON, WUMPUS, PIT, ARROW, WUMPUS_MOVED, NO_ARROWS = range(len(OUTCOMES))
+# До цієї кількості печер небезпеки розставляються перестановкою всіх печер
+PERMUTATION_LIMIT = 64
+
+
+class VectorWumpus:
+    """n незалежних ігор «Світ Вампусу» з масивами позицій замість об'єктів."""
+
+    def __init__(self, n_games, seed=None, caves=None, arrows=5):
+        """caves - граф печер CaveGraph з однаковим степенем печер (None - класична карта)."""
+        self.rng = np.random.default_rng(seed)
+        self.graph = CaveGraph.dodecahedron() if caves is None else caves
+        # Масив суміжності (кількість печер + 1) x степінь; рядок 0 не використовується
+        self.adjacency = self.graph.adjacency_array()
+        self.caves, self.degree = len(self.adjacency) - 1, self.adjacency.shape[1]
+        self.n_games = n_games
+
+        order = self._place_hazards(n_games)
+        self.wumpus = order[:, 0].copy()
+        self.pits = order[:, 1:3].copy()
+        self.bats = order[:, 3:5].copy()
+        # Гравець починає в печері без небезпек (шоста печера перестановки)
+        self.player = order[:, 5].copy()
+
+        self.arrows = np.full(n_games, arrows, dtype=np.int8)
+        self.outcome = np.zeros(n_games, dtype=np.int8)
+        self.steps = np.zeros(n_games, dtype=np.int32)
+
+    def _place_hazards(self, n_games):
+        """Шість різних печер для кожної гри: Вампус, дві ями, два кажани, гравець."""
+        if self.caves <= PERMUTATION_LIMIT:
+            # Перші елементи випадкової перестановки печер кожної гри
+            return np.argsort(self.rng.random((n_games, self.caves)), axis=1)[:, :6].astype(np.int32) + 1
+        # На великих картах перестановка завелика: вибірка з повтором, рядки зі
+        # збігами печер вибираються заново (таких рядків мало)
+        order = self.rng.integers(1, self.caves + 1, size=(n_games, 6), dtype=np.int32)
+        while True:
+            ordered = np.sort(order, axis=1)
+            repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+            if not repeated.size:
+                return order
+            order[repeated] = self.rng.integers(1, self.caves + 1, size=(repeated.size, 6), dtype=np.int32)
+
+    @property
+    def done(self):
+        return self.outcome != RUNNING
+
+    def observe(self, games=None):
+        """
+        Спостереження (для ігор games або всіх): печера, суміжні печери (n x степінь),
+        запах, протяг, шелест (булеві масиви) та кількість стріл.
+        """
+        games = slice(None) if games is None else games
+        player = self.player[games]
+        neighbors = self.adjacency[player]
+        return {
+            "cave": player,
+            "neighbors": neighbors,
+            "stench": (neighbors == self.wumpus[games, None]).any(axis=1),
+            "breeze": (neighbors[:, :, None] == self.pits[games, None, :]).any(axis=(1, 2)),
+            "rustle": (neighbors[:, :, None] == self.bats[games, None, :]).any(axis=(1, 2)),
+            "arrows": self.arrows[games],
+        }
+
+    def _finish(self, games, mask, code):
+        """Завершує ігри games[mask] з кодом code (лише ті, що ще тривають)."""
+        selected = games[mask]
+        selected = selected[self.outcome[selected] == RUNNING]
+        self.outcome[selected] = code
+
+    def _move(self, games, target):
+        neighbors = self.adjacency[self.player[games]]
+        valid = (neighbors == target[:, None]).any(axis=1)
+        games, target = games[valid], target[valid]
+        self.player[games] = target
+
+        self._finish(games, self.player[games] == self.wumpus[games], WUMPUS)
+        self._finish(games, (self.player[games, None] == self.pits[games]).any(axis=1), PIT)
+        # Кажани переносять у випадкову печеру, доки гравець не опиниться поза їхніми печерами
+        carried = games[(self.outcome[games] == RUNNING) &
+                        (self.player[games, None] == self.bats[games]).any(axis=1)]
+        while carried.size:
+            self.player[carried] = self.rng.integers(1, self.caves + 1, size=carried.size)
+            self._finish(carried, self.player[carried] == self.wumpus[carried], WUMPUS)
+            self._finish(carried, (self.player[carried, None] == self.pits[carried]).any(axis=1), PIT)
+            carried = carried[(self.outcome[carried] == RUNNING) &
+                              (self.player[carried, None] == self.bats[carried]).any(axis=1)]
+
+    def _shoot(self, games, path):
+        current = self.player[games].copy()
+        flying = np.ones(games.size, dtype=bool)
+        for column in range(min(path.shape[1], MAX_ARROW_PATH)):
+            flying &= path[:, column] > 0
+            if not flying.any():
+                break
+            index = np.flatnonzero(flying)
+            following = path[index, column].astype(np.int32)
+            neighbors = self.adjacency[current[index]]
+            # Неправильний відрізок - стріла відхиляється у випадкову суміжну печеру
+            wrong = ~(neighbors == following[:, None]).any(axis=1)
+            following[wrong] = neighbors[wrong, self.rng.integers(0, self.degree, size=int(wrong.sum()))]
+            current[index] = following
+
+            hit = following == self.wumpus[games[index]]
+            self._finish(games[index], hit, WON)
+            self_hit = ~hit & (following == self.player[games[index]])
+            self._finish(games[index], self_hit, ARROW)
+            flying[index[hit | self_hit]] = False
+
+        # Промах: Вампус переходить у суміжну печеру з ймовірністю 0.75
+        missed = games[self.outcome[games] == RUNNING]
+        moves = missed[self.rng.random(missed.size) < 0.75]
+        self.wumpus[moves] = self.adjacency[self.wumpus[moves], self.rng.integers(0, self.degree, size=moves.size)]
+        self._finish(moves, self.wumpus[moves] == self.player[moves], WUMPUS_MOVED)
+        self.arrows[missed] -= 1
+        self._finish(missed, self.arrows[missed] <= 0, NO_ARROWS)
+
+    def step(self, kind, target=None, path=None, games=None):
+        """
+        Один хід у іграх games (за замовчуванням - усіх незавершених).
+
+        kind    - масив дій: MOVE або SHOOT
+        target  - масив печер для руху
+        path    - масив n x 5 печер стріли (0 - кінець шляху)
+        """
+        games = np.flatnonzero(~self.done) if games is None else np.asarray(games)
+        kind = np.asarray(kind)
+        active = self.outcome[games] == RUNNING
+        self.steps[games[active]] += 1
+        moving = active & (kind == MOVE)
+        shooting = active & (kind == SHOOT) & (self.arrows[games] > 0)
+        if moving.any():
+            self._move(games[moving], np.asarray(target)[moving].astype(np.int32))
+        if shooting.any():
+            self._shoot(games[shooting], np.asarray(path)[shooting])
+
+    def run(self, policy, max_steps=100):
+        """
+        Грає всі ігри стратегією policy, доки вони не завершаться (або max_steps ходів).
+        Повертає словник: кількість ігор, частка перемог, кількість завершень
+        за кожною причиною, середня кількість ходів і час.
+        """
+        started = time.perf_counter()
+        for _ in range(max_steps):
+            games = np.flatnonzero(~self.done)
+            if not games.size:
+                break
+            kind, target, path = policy(self.observe(games), self.rng)
+            self.step(kind, target, path, games)
+        elapsed = time.perf_counter() - started
+        counts = np.bincount(self.outcome, minlength=len(OUTCOMES))
+        return {
+            "games": self.n_games,
+            "win_rate": counts[WON] / self.n_games,
+            "outcomes": {("running" if name is None else name): int(count) for name, count in zip(OUTCOMES, counts)},
+            "mean_steps": float(self.steps.mean()),
+            "seconds": elapsed,
+            "games_per_sec": self.n_games / elapsed if elapsed else None,
+        }
+
+
+def random_policy(observation, rng):
+    """
+    Базова стратегія: якщо відчувається запах, стріляти в одну випадкову суміжну
+    печеру, інакше йти у випадкову суміжну печеру.
+    """
+    neighbors = observation["neighbors"]
+    choice = neighbors[np.arange(len(neighbors)), rng.integers(0, neighbors.shape[1], size=len(neighbors))]
+    kind = np.where(observation["stench"], SHOOT, MOVE)
+    path = np.zeros((len(neighbors), MAX_ARROW_PATH), dtype=np.int32)
+    path[:, 0] = choice
+    return kind, choice, path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Оцінка стратегії на багатьох іграх «Світ Вампусу»")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--max-steps", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--caves", type=int, help="кількість печер випадкової карти (3 тунелі з кожної)")
+    parser.add_argument("--map", help="файл карти печер (див. caves.CaveGraph.load)")
+    args = parser.parse_args()
+
+    caves = None
+    if args.map:
+        caves = CaveGraph.load(args.map)
+    elif args.caves:
+        caves = CaveGraph.random_cubic(args.caves, args.seed)
+    result = VectorWumpus(args.games, args.seed, caves).run(random_policy, args.max_steps)
+    print(f"Ігор: {result['games']}, перемог: {result['win_rate']:.2%}, "
+          f"середня кількість ходів: {result['mean_steps']:.1f}, "
+          f"{result['games_per_sec']:.0f} ігор/с")
+    for name, count in result["outcomes"].items():
+        print(f"  {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()